@@ -5,15 +5,63 @@ Connects Blood Donors with Requestors
 Version 2.0 - Enhanced with Request-Donor Matching Flow
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
-from datetime import datetime, timedelta
-import uuid
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.serving import WSGIRequestHandler
+from datetime import datetime, date, timedelta
+import secrets
 import json
 import os
+import shutil
+import sys
+import time
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import threading
+import queue
+import atexit
+import signal
+
+try:
+    import numpy as np
+except ImportError:  # optional - match scoring falls back to the pure-Python loop
+    np = None
+
+try:
+    import orjson
+except ImportError:  # optional - persistence and API responses fall back to the stdlib json module
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes jsonify() responses with orjson
+
+    Only response bodies go through orjson; dumps/loads stay on the stdlib
+    provider because the session serializer relies on its object_hook.
+    """
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            options |= orjson.OPT_INDENT_2
+        body = orjson.dumps(obj, default=self.default, option=options)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
 
 app = Flask(__name__)
 app.secret_key = 'bloodsync-secret-key-2024-enhanced'
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # ============== DATA STORAGE (Persistent JSON Files) ==============
 
@@ -29,32 +77,323 @@ DONATIONS_FILE = os.path.join(DATA_DIR, 'donations.json')
 ASSIGNMENTS_FILE = os.path.join(DATA_DIR, 'assignments.json')
 INVENTORY_FILE = os.path.join(DATA_DIR, 'inventory.json')
 
-def load_json_file(file_path, default_value=None):
-    """Load data from JSON file"""
+# Write-ahead logs: one JSON line per mutation, replayed on top of the
+# snapshot files above at startup and folded back into them on compaction
+DONORS_WAL = os.path.join(DATA_DIR, 'donors.wal')
+REQUESTORS_WAL = os.path.join(DATA_DIR, 'requestors.wal')
+BLOOD_REQUESTS_WAL = os.path.join(DATA_DIR, 'blood_requests.wal')
+DONATIONS_WAL = os.path.join(DATA_DIR, 'donations.wal')
+ASSIGNMENTS_WAL = os.path.join(DATA_DIR, 'assignments.wal')
+INVENTORY_WAL = os.path.join(DATA_DIR, 'inventory.wal')
+
+WAL_FSYNC_EVERY = 16                 # fsync after this many appends
+WAL_SYNC_INTERVAL = 0.2              # ...or at most this many seconds after an append
+WAL_COMPACT_BYTES = 1024 * 1024      # compact once a log grows past 1MB
+
+_wal_lock = threading.RLock()
+_wal_handles = {}      # wal path -> open append-mode file object
+_wal_unsynced = {}     # wal path -> appends since last fsync
+_wal_snapshots = {}    # wal path -> (snapshot path, live dict)
+
+# Snapshot files are serialized by a single background writer thread so
+# request threads never block on serialization or the disk
+_write_queue = queue.Queue()
+WRITE_RETRIES = 5      # re-serialize attempts when a dict changes mid-dump
+SYNC_WORKERS = 4       # temp files flushed to disk in parallel per batch
+
+# Stores of same-shape records are saved as one shared key list plus a row
+# of values per record, instead of repeating every field name per record
+HOMOGENEOUS_FILES = {DONORS_FILE, DONATIONS_FILE, ASSIGNMENTS_FILE}
+
+def load_json_file(file_path, default_value=None, wal_path=None):
+    """Load data from JSON file, then replay its write-ahead log"""
+    data = None
     try:
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                data = _loads(f.read())
+            if isinstance(data, dict) and data.get('format') == 'homogeneous':
+                data = decode_homogeneous(data)
     except Exception as e:
         print(f"Error loading {file_path}: {e}")
-    return default_value if default_value is not None else {}
+    if data is None:
+        data = default_value if default_value is not None else {}
+    if wal_path and isinstance(data, dict):
+        replay_wal(wal_path + '.old', data)
+        replay_wal(wal_path, data)
+        _wal_snapshots[wal_path] = (file_path, data)
+    return data
+
+def save_json_file(file_path, data, on_saved=None):
+    """Queue data to be saved to a JSON file by the background writer"""
+    return save_many({file_path: data}, on_saved)
+
+def save_many(files, on_saved=None):
+    """Queue several {file path: data} saves to be committed together
+
+    on_saved runs once every file in the group has been replaced on disk.
+    """
+    _write_queue.put((dict(files), on_saved))
+    return True
+
+def serialize_json_file(file_path, data):
+    """Encode a snapshot for file_path, or None if it could not be serialized"""
+    for _ in range(WRITE_RETRIES):
+        try:
+            if file_path in HOMOGENEOUS_FILES and isinstance(data, dict):
+                return _dumps(encode_homogeneous(data))
+            return _dumps(data)
+        except RuntimeError:
+            continue  # dict resized by a request thread while dumping
+    print(f"Error saving {file_path}: data kept changing during serialization")
+    return None
+
+def write_json_files(files):
+    """Save {file path: data} atomically per file, as one batch
+
+    Every payload is serialized and written to its temp file first; the
+    renames then happen back to back, followed by one directory fsync.
+    Returns the set of paths that were saved.
+    """
+    written = []
+    for file_path, data in files.items():
+        payload = serialize_json_file(file_path, data)
+        if payload is None:
+            continue
+        tmp_path = file_path + '.tmp'
+        try:
+            f = open(tmp_path, 'wb')
+            f.write(payload)
+            f.flush()
+            written.append((f, tmp_path, file_path))
+        except Exception as e:
+            print(f"Error saving {file_path}: {e}")
+    # Flush the temp files to the device concurrently rather than one by one
+    if len(written) > 1:
+        synced = list(_sync_pool().map(_sync_and_close, [f for f, _, _ in written]))
+    else:
+        synced = [_sync_and_close(f) for f, _, _ in written]
+    staged = [(tmp_path, file_path) for (_, tmp_path, file_path), ok in zip(written, synced) if ok]
+    saved = set()
+    for tmp_path, file_path in staged:
+        try:
+            os.replace(tmp_path, file_path)
+            saved.add(file_path)
+        except Exception as e:
+            print(f"Error saving {file_path}: {e}")
+    if saved:
+        fsync_dir(DATA_DIR)
+    return saved
+
+_sync_executor = None
+
+def _sync_pool():
+    """Small thread pool used to fdatasync several snapshot files at once"""
+    global _sync_executor
+    if _sync_executor is None:
+        _sync_executor = ThreadPoolExecutor(max_workers=SYNC_WORKERS, thread_name_prefix='json-sync')
+    return _sync_executor
+
+def _sync_and_close(f):
+    """Flush a written temp file's data to disk and close it; False on failure"""
+    try:
+        try:
+            (os.fdatasync if hasattr(os, 'fdatasync') else os.fsync)(f.fileno())
+        finally:
+            f.close()
+        return True
+    except OSError as e:
+        print(f"Error syncing {f.name}: {e}")
+        return False
+
+def fsync_dir(path):
+    """fsync a directory so renames inside it survive a crash"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # not supported on every platform/filesystem
+    finally:
+        os.close(fd)
+
+def encode_homogeneous(records):
+    """Encode {key: record} as a shared schema plus one value row per record
+
+    Rows are [key, value, ...] in schema order. The schema is the most common
+    field layout; a record with any other layout is kept as a {key: record}
+    row, so the original record order is preserved.
+    """
+    layouts = {}
+    for record in records.values():
+        layout = tuple(record)
+        layouts[layout] = layouts.get(layout, 0) + 1
+    schema = max(layouts, key=layouts.get) if layouts else ()
+    rows = []
+    for key, record in records.items():
+        if tuple(record) == schema:
+            rows.append([key, *record.values()])
+        else:
+            rows.append({key: record})
+    return {'format': 'homogeneous', 'schema': list(schema), 'rows': rows}
+
+def decode_homogeneous(doc):
+    """Rebuild {key: record} from the output of encode_homogeneous"""
+    schema = doc['schema']
+    records = {}
+    for row in doc['rows']:
+        if isinstance(row, dict):
+            records.update(row)
+        else:
+            records[row[0]] = dict(zip(schema, row[1:]))
+    return records
+
+def writer_loop():
+    """Drain queued snapshot saves, writing only the latest one per file"""
+    while True:
+        items = [_write_queue.get()]
+        while True:
+            try:
+                items.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        pending = {}
+        for files, _ in items:
+            pending.update(files)
+        saved = write_json_files(pending)
+        for files, on_saved in items:
+            if on_saved is not None and saved.issuperset(files):
+                on_saved()
+        for _ in items:
+            _write_queue.task_done()
+
+_writer_thread = threading.Thread(target=writer_loop, name='json-writer', daemon=True)
+_writer_thread.start()
+
+@atexit.register
+def flush_writes():
+    """Wait for every queued snapshot save to reach disk on shutdown"""
+    _write_queue.join()
+
+def replay_wal(wal_path, data):
+    """Apply logged put/del operations to a loaded snapshot"""
+    if not os.path.exists(wal_path):
+        return
+    try:
+        with open(wal_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    break  # torn last line from an interrupted write
+                if entry['op'] == 'put':
+                    data[entry['k']] = entry['v']
+                elif entry['op'] == 'del':
+                    data.pop(entry['k'], None)
+    except Exception as e:
+        print(f"Error replaying {wal_path}: {e}")
 
-def save_json_file(file_path, data):
-    """Save data to JSON file"""
+def append_wal(wal_path, op, key, value=None):
+    """Append a single put/del mutation to a write-ahead log"""
+    return append_wal_batch(wal_path, [(op, key, value)])
+
+def append_wal_batch(wal_path, entries, sync=False):
+    """Append several (op, key, value) mutations with a single write
+
+    With sync=True the log is fsynced before returning; otherwise the fsync
+    is batched with later appends or done by the periodic syncer.
+    """
     try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        lines = b''.join(
+            _dumps({'op': op, 'k': key, 'v': value}) + b'\n'
+            for op, key, value in entries
+        )
+        with _wal_lock:
+            f = _wal_handles.get(wal_path)
+            if f is None:
+                f = _wal_handles[wal_path] = open(wal_path, 'ab')
+            f.write(lines)
+            f.flush()
+            _wal_unsynced[wal_path] = _wal_unsynced.get(wal_path, 0) + len(entries)
+            if sync or _wal_unsynced[wal_path] >= WAL_FSYNC_EVERY:
+                os.fsync(f.fileno())
+                _wal_unsynced[wal_path] = 0
+            if f.tell() >= WAL_COMPACT_BYTES:
+                compact_wal(wal_path)
         return True
     except Exception as e:
-        print(f"Error saving {file_path}: {e}")
+        print(f"Error appending to {wal_path}: {e}")
         return False
 
+def compact_wal(wal_path):
+    """Rotate a write-ahead log aside and queue a snapshot rewrite for it
+
+    The rotated segment is only removed once the background writer has
+    saved a snapshot taken after the rotation, so every logged mutation is
+    always in either the snapshot or a log that is replayed on startup.
+    """
+    with _wal_lock:
+        if wal_path not in _wal_snapshots:
+            return False
+        old_path = wal_path + '.old'
+        if os.path.exists(old_path):
+            return False  # previous compaction still waiting on the writer
+        file_path, data = _wal_snapshots[wal_path]
+        f = _wal_handles.pop(wal_path, None)
+        if f is not None:
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+        os.replace(wal_path, old_path)
+        _wal_unsynced[wal_path] = 0
+        return save_json_file(file_path, data, on_saved=lambda: os.remove(old_path))
+
+def wal_sync_loop():
+    """fsync logs with pending appends every WAL_SYNC_INTERVAL seconds"""
+    while True:
+        time.sleep(WAL_SYNC_INTERVAL)
+        with _wal_lock:
+            for wal_path, f in list(_wal_handles.items()):
+                if _wal_unsynced.get(wal_path):
+                    try:
+                        os.fsync(f.fileno())
+                        _wal_unsynced[wal_path] = 0
+                    except Exception as e:
+                        print(f"Error syncing {wal_path}: {e}")
+
+_wal_sync_thread = threading.Thread(target=wal_sync_loop, name='wal-sync', daemon=True)
+_wal_sync_thread.start()
+
+@atexit.register
+def sync_wals():
+    """Flush and fsync every open write-ahead log on shutdown"""
+    with _wal_lock:
+        for wal_path, f in list(_wal_handles.items()):
+            try:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+            except Exception as e:
+                print(f"Error syncing {wal_path}: {e}")
+        _wal_handles.clear()
+        _wal_unsynced.clear()
+
+def _exit_on_sigterm(signum, frame):
+    """Turn SIGTERM into a normal exit so the atexit flushes above still run"""
+    sys.exit(128 + signum)
+
+if threading.current_thread() is threading.main_thread() and \
+        signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
 # Load data from JSON files on startup
-donors_db = load_json_file(DONORS_FILE, {})
-requestors_db = load_json_file(REQUESTORS_FILE, {})
-blood_requests_db = load_json_file(BLOOD_REQUESTS_FILE, {})
-donations_db = load_json_file(DONATIONS_FILE, {})
-donor_request_assignments = load_json_file(ASSIGNMENTS_FILE, {})
+donors_db = load_json_file(DONORS_FILE, {}, DONORS_WAL)
+requestors_db = load_json_file(REQUESTORS_FILE, {}, REQUESTORS_WAL)
+blood_requests_db = load_json_file(BLOOD_REQUESTS_FILE, {}, BLOOD_REQUESTS_WAL)
+donations_db = load_json_file(DONATIONS_FILE, {}, DONATIONS_WAL)
+donor_request_assignments = load_json_file(ASSIGNMENTS_FILE, {}, ASSIGNMENTS_WAL)
 
 # Blood inventory by blood group - with persistent storage
 DEFAULT_INVENTORY = {
@@ -67,7 +406,112 @@ DEFAULT_INVENTORY = {
     'O+': {'units': 60, 'donors': []},
     'O-': {'units': 40, 'donors': []}
 }
-blood_inventory = load_json_file(INVENTORY_FILE, DEFAULT_INVENTORY)
+blood_inventory = load_json_file(INVENTORY_FILE, DEFAULT_INVENTORY, INVENTORY_WAL)
+
+# Persisted stores by name -> (live dict, write-ahead log)
+PERSISTED_STORES = {
+    'donors': (donors_db, DONORS_WAL),
+    'requestors': (requestors_db, REQUESTORS_WAL),
+    'requests': (blood_requests_db, BLOOD_REQUESTS_WAL),
+    'donations': (donations_db, DONATIONS_WAL),
+    'assignments': (donor_request_assignments, ASSIGNMENTS_WAL),
+    'inventory': (blood_inventory, INVENTORY_WAL)
+}
+
+# Per-store version counters, bumped on every write to the store. Derived
+# read results are cached under the versions they were computed from, so a
+# write invalidates them without any explicit cache bookkeeping.
+_data_versions = dict.fromkeys(PERSISTED_STORES, 0)
+_versions_lock = threading.Lock()
+_versioned_cache = {}
+VERSIONED_CACHE_SIZE = 256
+
+def bump_version(name):
+    """Record that a persisted store has changed
+
+    Call it after the change (data, indexes and side caches alike), so a
+    result computed under the new version never sees the old state.
+    """
+    with _versions_lock:
+        _data_versions[name] += 1
+
+# Version counters restart at zero with the process, so ETags built from them
+# also carry a per-process token to keep a client's tag from an earlier run
+# matching by accident.
+_ETAG_BOOT_ID = secrets.token_hex(4)
+POLL_CACHE_CONTROL = 'private, max-age=1, must-revalidate'
+
+def versions_etag(stores):
+    """Opaque tag that changes whenever any of the named stores changes"""
+    return '-'.join([_ETAG_BOOT_ID] + [str(_data_versions[store]) for store in stores])
+
+def conditional_response(stores, build):
+    """Answer 304 when the client's ETag still matches, else build() the response
+
+    For polled endpoints whose body depends only on the named stores.
+    """
+    etag = versions_etag(stores)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = build()
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = POLL_CACHE_CONTROL
+    return response
+
+def versioned(name, stores, compute, *args):
+    """Return compute(), cached until any of the named stores changes
+
+    Extra args become part of the cache key, for results that depend on more
+    than the stores themselves (a blood group, the current day, ...).
+    """
+    key = (name, args, tuple(_data_versions[store] for store in stores))
+    try:
+        return _versioned_cache[key]
+    except KeyError:
+        pass
+    value = compute()
+    if len(_versioned_cache) >= VERSIONED_CACHE_SIZE:
+        _versioned_cache.clear()
+    _versioned_cache[key] = value
+    return value
+
+def render_cached(endpoint, stores, render):
+    """HTML from render(), reused until any of the named stores changes
+
+    For pages drawn purely from the stores. A page rendered while flash
+    messages are pending shows (and consumes) them, so it is never cached.
+    """
+    if '_flashes' in session:
+        return render()
+    return versioned('page', stores, render, endpoint)
+
+def mark_dirty(name, key, sync=False):
+    """Mark an entity as changed so it is persisted once, at request end
+
+    sync=True makes the response wait until that store's log is fsynced.
+    """
+    if 'dirty' not in g:
+        g.dirty = {}
+        g.dirty_sync = set()
+    g.dirty.setdefault(name, set()).add(key)
+    bump_version(name)
+    if sync:
+        g.dirty_sync.add(name)
+
+@app.after_request
+def flush_dirty(response):
+    """Write every entity touched by this request, one batch per store"""
+    dirty = g.pop('dirty', None)
+    dirty_sync = g.pop('dirty_sync', set())
+    if dirty:
+        for name, keys in dirty.items():
+            data, wal_path = PERSISTED_STORES[name]
+            append_wal_batch(wal_path, [
+                ('put', key, data[key]) if key in data else ('del', key, None)
+                for key in keys
+            ], sync=name in dirty_sync)
+    return response
 
 # ============== BLOOD COMPATIBILITY MATRIX ==============
 # Who can DONATE TO whom (Donor Blood Group -> Recipient Blood Groups)
@@ -94,71 +538,449 @@ RECEIVE_COMPATIBILITY = {
     'O-': ['O-']
 }
 
+# Intern the blood group names so comparisons are mostly pointer checks (the
+# ordered tuples are what get displayed and returned by the API)
+BLOOD_COMPATIBILITY = {sys.intern(k): tuple(map(sys.intern, v)) for k, v in BLOOD_COMPATIBILITY.items()}
+RECEIVE_COMPATIBILITY = {sys.intern(k): tuple(map(sys.intern, v)) for k, v in RECEIVE_COMPATIBILITY.items()}
+
+# One bit per blood group, and each table row folded into a bitmask, so a
+# compatibility test is a single integer AND
+BLOOD_GROUP_BITS = {'O-': 1, 'O+': 2, 'A-': 4, 'A+': 8, 'B-': 16, 'B+': 32, 'AB-': 64, 'AB+': 128}
+DONATES_TO_MASK = {k: sum(BLOOD_GROUP_BITS[bg] for bg in v) for k, v in BLOOD_COMPATIBILITY.items()}
+RECEIVES_FROM_MASK = {k: sum(BLOOD_GROUP_BITS[bg] for bg in v) for k, v in RECEIVE_COMPATIBILITY.items()}
+
+def intern_blood_group(blood_group):
+    """Return the interned copy of a blood group name"""
+    return sys.intern(blood_group) if isinstance(blood_group, str) else blood_group
+
+# Inventory stock thresholds (units) used for status labels
+CRITICAL_UNITS = 20
+LOW_UNITS = 40
+
+# Listing order for open requests: most urgent first
+URGENCY_ORDER = {'critical': 0, 'high': 1, 'normal': 2}
+
+# ============== SECONDARY INDEXES ==============
+# Maintained on every write to an indexed record so reads never scan a whole table
+
+donors_by_bg = {}              # blood group -> donor ids
+donors_by_city = {}            # lowercased city -> donor ids
+donors_by_state = {}           # lowercased state -> donor ids
+donors_by_pincode = {}         # pincode -> donor ids
+available_active_donors = set()
+requests_by_bg = {}            # blood group -> request ids
+requests_by_status = {}        # status -> request ids
+requests_by_requestor = {}     # requestor id -> request ids, newest created_at first
+assignments_by_donor = {}      # donor id -> assignment ids, in creation order
+assignments_by_request = {}    # request id -> assignment ids, in creation order
+assignment_by_pair = {}        # (donor id, request id) -> assignment id
+donations_by_donor = {}        # donor id -> donation ids, newest donation_date first
+fulfilled_history_by_request = {}  # request id -> display rows of its completed donations, in recorded order
+_inventory_donor_sets = {}     # blood group -> (inventory 'donors' list, set of the same ids)
+RECENT_REQUESTS = 5
+recent_request_ids = []        # newest request ids by created_at, at most RECENT_REQUESTS
+
+_donor_index_keys = {}         # donor id -> (blood group, city, state, pincode) currently indexed
+_donor_bg_bits = {}            # donor id -> BLOOD_GROUP_BITS bit of its blood group (0 if unknown)
+_donor_seq = {}                # donor id -> registration order, for stable result ordering
+_location_place_cache = {}     # lowercased search text -> (city keys, state keys, pincode keys) it matches
+_request_index_keys = {}       # request id -> (blood group, status) currently indexed
+_request_bg_bits = {}          # request id -> BLOOD_GROUP_BITS bit of its blood group (0 if unknown)
+_request_sort_keys = {}        # request id -> (urgency rank, created_at) for open-request listings
+_donor_last_donation = {}      # donor id -> parsed last_donation date
+_donor_scores = {}             # donor id -> (day computed, eligibility score)
+_donor_sort_keys = {}          # donor id -> last_donation sort key ('1900-01-01' if never)
+
+def _rebucket(index, old_key, new_key, item_id):
+    """Move an id from one bucket of a secondary index to another
+
+    Returns True when a bucket was created or removed, i.e. the index's set
+    of keys changed.
+    """
+    keys_changed = False
+    if old_key is not None:
+        bucket = index.get(old_key)
+        if bucket is not None:
+            bucket.discard(item_id)
+            if not bucket:
+                del index[old_key]
+                keys_changed = True
+    if new_key is not None:
+        if new_key not in index:
+            index[new_key] = set()
+            keys_changed = True
+        index[new_key].add(item_id)
+    return keys_changed
+
+def _index_donor(donor_id):
+    """Refresh a donor's index entries and cached derived values after a write"""
+    donor = donors_db.get(donor_id)
+    old = _donor_index_keys.pop(donor_id, (None, None, None, None))
+    new = (None, None, None, None)
+    _donor_scores.pop(donor_id, None)
+    _donor_last_donation.pop(donor_id, None)
+    _donor_sort_keys.pop(donor_id, None)
+    _donor_bg_bits.pop(donor_id, None)
+    if donor:
+        _donor_last_donation[donor_id] = parse_donation_date(donor.get('last_donation'))
+        _donor_sort_keys[donor_id] = donor.get('last_donation') or '1900-01-01'
+        _soa_update(donor_id)
+        _donor_seq.setdefault(donor_id, len(_donor_seq))
+        new = (intern_blood_group(donor.get('blood_group')),
+               (donor.get('city') or '').lower(),
+               (donor.get('state') or '').lower(),
+               str(donor.get('pincode') or ''))
+        _donor_index_keys[donor_id] = new
+        _donor_bg_bits[donor_id] = BLOOD_GROUP_BITS.get(new[0], 0)
+    _rebucket(donors_by_bg, old[0], new[0], donor_id)
+    places_changed = _rebucket(donors_by_city, old[1], new[1], donor_id)
+    places_changed |= _rebucket(donors_by_state, old[2], new[2], donor_id)
+    places_changed |= _rebucket(donors_by_pincode, old[3], new[3], donor_id)
+    if places_changed:
+        _location_place_cache.clear()
+    if donor and donor.get('available', True) and donor.get('status') == 'active':
+        available_active_donors.add(donor_id)
+    else:
+        available_active_donors.discard(donor_id)
+    bump_version('donors')
+
+def _index_request(request_id):
+    """Refresh a blood request's entries in the request indexes after a write"""
+    request_data = blood_requests_db.get(request_id)
+    old = _request_index_keys.pop(request_id, (None, None))
+    new = (None, None)
+    _request_sort_keys.pop(request_id, None)
+    _request_bg_bits.pop(request_id, None)
+    if request_data:
+        new = (intern_blood_group(request_data.get('blood_group')), request_data.get('status'))
+        _request_index_keys[request_id] = new
+        _request_bg_bits[request_id] = BLOOD_GROUP_BITS.get(new[0], 0)
+        _request_sort_keys[request_id] = (URGENCY_ORDER.get(request_data.get('urgency'), 2),
+                                          request_data.get('created_at') or '1900-01-01')
+    _rebucket(requests_by_bg, old[0], new[0], request_id)
+    _rebucket(requests_by_status, old[1], new[1], request_id)
+    if request_data and old == (None, None):
+        _remember_recent_request(request_id)
+        _insert_newest_first(requests_by_requestor.setdefault(request_data.get('requestor_id'), []),
+                             request_id, _request_created_at)
+    bump_version('requests')
+
+def _insert_newest_first(ids, new_id, sort_key):
+    """Insert an id into a list ordered by sort_key descending, after any ties
+
+    Ties keep arrival order, matching a stable sort(reverse=True).
+    """
+    new_key = sort_key(new_id)
+    position = 0
+    while position < len(ids) and sort_key(ids[position]) >= new_key:
+        position += 1
+    ids.insert(position, new_id)
+
+def _request_created_at(request_id):
+    return blood_requests_db[request_id].get('created_at') or ''
+
+def _donation_date(donation_id):
+    return donations_db[donation_id].get('donation_date') or ''
+
+def _remember_recent_request(request_id):
+    """Slot a newly indexed request into the newest-first recent list"""
+    _insert_newest_first(recent_request_ids, request_id, _request_created_at)
+    del recent_request_ids[RECENT_REQUESTS:]
+
+def add_inventory_donor(blood_group, donor_id):
+    """Add a donor to an inventory group's donor list unless already there
+
+    Membership is checked against a set kept alongside the persisted list.
+    Returns True if the donor was added.
+    """
+    donor_list = blood_inventory[blood_group].setdefault('donors', [])
+    cached = _inventory_donor_sets.get(blood_group)
+    if cached is None or cached[0] is not donor_list:
+        cached = _inventory_donor_sets[blood_group] = (donor_list, set(donor_list))
+    if donor_id in cached[1]:
+        return False
+    donor_list.append(donor_id)
+    cached[1].add(donor_id)
+    bump_version('inventory')
+    return True
+
+def _index_donation(donation_id):
+    """Add a newly recorded donation to the donor and request history indexes"""
+    donation = donations_db[donation_id]
+    donor_id = donation.get('donor_id')
+    _insert_newest_first(donations_by_donor.setdefault(donor_id, []), donation_id, _donation_date)
+    # Donations are never edited once recorded, so the display row can be built now
+    request_id = donation.get('request_id')
+    if request_id and donation.get('status') == 'completed':
+        fulfilled_history_by_request.setdefault(request_id, []).append({
+            'donation_id': donation['donation_id'],
+            'donor_name': donation.get('donor_name', 'Unknown'),
+            'blood_group': donation['blood_group'],
+            'units': donation['units'],
+            'donation_date': donation.get('donation_date', 'N/A'),
+            'hospital_name': donation.get('hospital_name', 'N/A')
+        })
+    bump_version('donations')
+
+def _index_assignment(assignment, add=True):
+    """Add an assignment to (or remove it from) the assignment indexes"""
+    assignment_id = assignment['assignment_id']
+    donor_id = assignment['donor_id']
+    request_id = assignment['request_id']
+    if add:
+        assignments_by_donor.setdefault(donor_id, []).append(assignment_id)
+        assignments_by_request.setdefault(request_id, []).append(assignment_id)
+        assignment_by_pair[(donor_id, request_id)] = assignment_id
+    else:
+        for index, key in ((assignments_by_donor, donor_id), (assignments_by_request, request_id)):
+            if assignment_id in index.get(key, []):
+                index[key].remove(assignment_id)
+        if assignment_by_pair.get((donor_id, request_id)) == assignment_id:
+            del assignment_by_pair[(donor_id, request_id)]
+    bump_version('assignments')
+
+def rebuild_indexes():
+    """Build every secondary index from the loaded data (startup only)"""
+    for donor_id in donors_db:
+        _index_donor(donor_id)
+    for request_id in blood_requests_db:
+        _index_request(request_id)
+    for assignment in donor_request_assignments.values():
+        _index_assignment(assignment)
+    for donation_id in donations_db:
+        _index_donation(donation_id)
+
+def donors_matching_location(location, include_pincode=False):
+    """Donor ids whose city or state (optionally pincode) contains the given text
+
+    The substring test runs once per distinct place and the matching place
+    keys are cached per search text until a place is added or removed.
+    """
+    loc = location.lower()
+    places = _location_place_cache.get(loc)
+    if places is None:
+        places = tuple([place for place in index if loc in place]
+                       for index in (donors_by_city, donors_by_state, donors_by_pincode))
+        _location_place_cache[loc] = places
+    indexes = (donors_by_city, donors_by_state, donors_by_pincode)
+    matched = set()
+    for index, keys in zip(indexes if include_pincode else indexes[:2], places):
+        for place in keys:
+            matched |= index[place]
+    return matched
+
+def in_registration_order(donor_ids):
+    """Sort donor ids into the order they were registered (donors_db order)"""
+    return sorted(donor_ids, key=_donor_seq.__getitem__)
+
+# ============== VECTORIZED DONOR COLUMNS (optional NumPy) ==============
+# Struct-of-arrays copy of the donor fields used for match scoring, one row per
+# donor, kept current by _index_donor. Only used once a match has enough
+# candidates for NumPy to beat the per-donor Python loop.
+
+VECTORIZE_MIN_DONORS = 256
+
+_soa_ids = []                  # row -> donor id
+_soa_rows = {}                 # donor id -> row
+_soa_columns = {}              # column name -> array (capacity >= len(_soa_ids))
+_SOA_DTYPES = {
+    'age': 'int16',
+    'available': 'bool',
+    'total_donations': 'int32',
+    'has_last_donation': 'bool',
+    'last_donation_ord': 'int32'   # date.toordinal(), 0 if missing/invalid
+}
+
+def _soa_update(donor_id):
+    """Copy a donor's scoring fields into its row of the column arrays"""
+    donor = donors_db.get(donor_id)
+    if np is None or donor is None:
+        return
+    row = _soa_rows.get(donor_id)
+    if row is None:
+        row = _soa_rows[donor_id] = len(_soa_ids)
+        _soa_ids.append(donor_id)
+        capacity = len(_soa_columns['age']) if _soa_columns else 0
+        if row >= capacity:
+            new_capacity = max(64, capacity * 2)
+            for name, dtype in _SOA_DTYPES.items():
+                grown = np.zeros(new_capacity, dtype=dtype)
+                if capacity:
+                    grown[:capacity] = _soa_columns[name]
+                _soa_columns[name] = grown
+    last = _donor_last_donation.get(donor_id)
+    _soa_columns['age'][row] = donor.get('age', 0)
+    _soa_columns['available'][row] = bool(donor.get('available', True))
+    _soa_columns['total_donations'][row] = donor.get('total_donations', 0)
+    _soa_columns['has_last_donation'][row] = bool(donor.get('last_donation'))
+    _soa_columns['last_donation_ord'][row] = last.toordinal() if last else 0
+
+def score_donors_vectorized(donor_ids, today, limit):
+    """Score donors with NumPy and return the top `limit` as match rows"""
+    rows = np.fromiter((_soa_rows[donor_id] for donor_id in donor_ids), dtype=np.int64, count=len(donor_ids))
+    age = _soa_columns['age'][rows]
+    last_ord = _soa_columns['last_donation_ord'][rows]
+    days_since = today.toordinal() - last_ord
+    
+    # Same rules as calculate_donor_eligibility / can_donate
+    scores = np.full(len(rows), 100, dtype=np.int32)
+    scores += np.where((age >= 25) & (age <= 45), 10, np.where((age < 18) | (age > 65), -50, 0))
+    scores -= np.where(_soa_columns['available'][rows], 0, 100)
+    scores += np.where(_soa_columns['has_last_donation'][rows],
+                       np.where((last_ord > 0) & (days_since > 90), 5, 0), 10)
+    scores += np.minimum(_soa_columns['total_donations'][rows] * 2, 20)
+    np.clip(scores, 0, 150, out=scores)
+    can_donate_now = (last_ord == 0) | (days_since >= 56)
+    
+    # Rank by score, then most recent donation - the order the Python path produces
+    rank = (scores.astype(np.int64) << 20) | last_ord
+    top = np.argpartition(-rank, limit - 1)[:limit] if len(rank) > limit else np.arange(len(rank))
+    top = top[np.argsort(-rank[top], kind='stable')]
+    return [{
+        **donors_db[_soa_ids[rows[i]]],
+        'match_score': int(scores[i]),
+        'can_donate_now': bool(can_donate_now[i])
+    } for i in top]
+
 # ============== HELPER FUNCTIONS ==============
 
+def wants_json():
+    """True when the caller is a script asking for JSON rather than a browser"""
+    return request.path.startswith('/api/') or request.accept_mimetypes.best == 'application/json'
+
+def flash_message(message, category='message'):
+    """flash() for browser callers only
+
+    A script never renders the next page, so its flashes would just pile up
+    in the session cookie and cost a re-signed cookie on every response.
+    """
+    if not wants_json():
+        flash(message, category)
+
 def generate_donor_id():
     """Generate unique donor ID"""
-    return f"DON-{uuid.uuid4().hex[:8].upper()}"
+    return f"DON-{secrets.token_hex(4).upper()}"
 
 def generate_requestor_id():
     """Generate unique requestor ID"""
-    return f"REQ-{uuid.uuid4().hex[:8].upper()}"
+    return f"REQ-{secrets.token_hex(4).upper()}"
 
 def generate_request_id():
     """Generate unique blood request ID"""
-    return f"BR-{uuid.uuid4().hex[:8].upper()}"
+    return f"BR-{secrets.token_hex(4).upper()}"
 
 def generate_donation_id():
     """Generate unique donation ID"""
-    return f"DN-{uuid.uuid4().hex[:8].upper()}"
+    return f"DN-{secrets.token_hex(4).upper()}"
 
 def generate_assignment_id():
     """Generate unique assignment ID"""
-    return f"ASGN-{uuid.uuid4().hex[:8].upper()}"
+    return f"ASGN-{secrets.token_hex(4).upper()}"
 
 def get_compatible_donor_blood_groups(recipient_blood_group):
     """
     Get list of donor blood groups that can donate to recipient
     Example: For A+ recipient, returns ['A+', 'A-', 'O+', 'O-']
     """
-    return RECEIVE_COMPATIBILITY.get(recipient_blood_group, [])
-
-def get_compatible_donors(recipient_blood_group, location=None):
+    return RECEIVE_COMPATIBILITY.get(recipient_blood_group, ())
+
+def get_compatible_donor_ids(recipient_blood_group, location=None):
+    """Ids of available, active donors who can donate to the recipient's blood group"""
+    # Check location if specified - far fewer donors match a place than a
+    # blood group, so start from those and test the group against the bitmask
+    if location:
+        compatible_mask = RECEIVES_FROM_MASK.get(recipient_blood_group, 0)
+        return {donor_id for donor_id in donors_matching_location(location) & available_active_donors
+                if _donor_bg_bits[donor_id] & compatible_mask}
+    
+    candidate_ids = set()
+    for bg in RECEIVE_COMPATIBILITY.get(recipient_blood_group, ()):
+        candidate_ids |= donors_by_bg.get(bg, set())
+    return candidate_ids & available_active_donors
+
+def get_compatible_donors(recipient_blood_group, location=None, limit=None):
     """
     Find compatible donors who can donate to recipient's blood group
-    Returns list of compatible donors
+    Returns list of compatible donors, most recent donation first
+    (only the first `limit` of them when a limit is given)
     """
-    compatible_blood_groups = get_compatible_donor_blood_groups(recipient_blood_group)
-    compatible_donors = []
-    
-    for donor_id, donor in donors_db.items():
-        if donor['blood_group'] in compatible_blood_groups:
-            if donor['available'] and donor['status'] == 'active':
-                # Check location if specified
-                if location:
-                    if (location.lower() in donor.get('city', '').lower() or 
-                        location.lower() in donor.get('state', '').lower()):
-                        compatible_donors.append(donor)
-                else:
-                    compatible_donors.append(donor)
-    
-    # Sort by last donation date (most recent first)
-    # Use a fallback string when value is None to avoid TypeError during comparison
-    compatible_donors.sort(key=lambda x: (x.get('last_donation') or '1900-01-01'), reverse=True)
-    return compatible_donors
-
-def can_donate(last_donation_date):
+    candidate_ids = get_compatible_donor_ids(recipient_blood_group, location)
+    
+    # Sort by last donation date (most recent first), using the precomputed sort key
+    if limit is not None:
+        ranked_ids = heapq.nlargest(limit, candidate_ids, key=_donor_sort_keys.__getitem__)
+    else:
+        ranked_ids = sorted(candidate_ids, key=_donor_sort_keys.__getitem__, reverse=True)
+    return [donors_db[donor_id] for donor_id in ranked_ids]
+
+def request_now():
+    """Current time, read once per request so every timestamp in it agrees"""
+    if not has_request_context():
+        return datetime.now()
+    if 'now' not in g:
+        g.now = datetime.now()
+    return g.now
+
+def request_today():
+    """Today's date as of request_now()"""
+    return request_now().date()
+
+# The stored timestamp formats are ISO 8601 shapes, which isoformat() produces
+# directly without strftime's per-call format parsing and locale handling.
+_ISO_FORMATTERS = {
+    '%Y-%m-%d %H:%M:%S': lambda now: now.isoformat(' ', 'seconds'),
+    '%Y-%m-%d': lambda now: now.date().isoformat()
+}
+
+def format_timestamp(now, fmt):
+    """Format a datetime, taking the isoformat() fast path for the stored formats"""
+    formatter = _ISO_FORMATTERS.get(fmt)
+    return formatter(now) if formatter else now.strftime(fmt)
+
+def timestamp(fmt='%Y-%m-%d %H:%M:%S'):
+    """request_now() formatted, computed once per request for each format"""
+    if not has_request_context():
+        return format_timestamp(datetime.now(), fmt)
+    formatted = g.setdefault('timestamps', {})
+    if fmt not in formatted:
+        formatted[fmt] = format_timestamp(request_now(), fmt)
+    return formatted[fmt]
+
+def parse_donation_date(value):
+    """Parse a 'YYYY-MM-DD' last donation string into a date (None if missing/invalid)"""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+def donor_last_donation_date(donor):
+    """Parsed last donation date of a donor, cached until the donor is next written"""
+    donor_id = donor.get('donor_id')
+    if donor_id in _donor_last_donation:
+        return _donor_last_donation[donor_id]
+    return parse_donation_date(donor.get('last_donation'))
+
+def can_donate(last_donation_date, today=None):
     """Check if donor can donate (56 days gap required)"""
     if not last_donation_date:
         return True
-    try:
-        last = datetime.strptime(last_donation_date, '%Y-%m-%d')
-        return (datetime.now() - last).days >= 56
-    except:
-        return True
-
-def calculate_donor_eligibility(donor):
-    """Calculate donor eligibility score"""
+    if isinstance(last_donation_date, str):
+        last_donation_date = parse_donation_date(last_donation_date)
+        if last_donation_date is None:
+            return True
+    today = today or request_today()
+    return (today - last_donation_date).days >= 56
+
+def calculate_donor_eligibility(donor, today=None):
+    """Calculate donor eligibility score (cached per donor for the current day)"""
+    today = today or request_today()
+    donor_id = donor.get('donor_id')
+    cached = _donor_scores.get(donor_id)
+    if cached is not None and cached[0] == today:
+        return cached[1]
+    
     score = 100
     
     # Age factor
@@ -173,14 +995,10 @@ def calculate_donor_eligibility(donor):
         score -= 100
     
     # Last donation recency
-    last_donation = donor.get('last_donation')
-    if last_donation:
-        try:
-            days_since = (datetime.now() - datetime.strptime(last_donation, '%Y-%m-%d')).days
-            if days_since > 90:
-                score += 5
-        except:
-            pass
+    if donor.get('last_donation'):
+        last = donor_last_donation_date(donor)
+        if last and (today - last).days > 90:
+            score += 5
     else:
         score += 10  # New donor bonus
     
@@ -188,32 +1006,54 @@ def calculate_donor_eligibility(donor):
     total_donations = donor.get('total_donations', 0)
     score += min(total_donations * 2, 20)
     
-    return max(0, min(score, 150))
+    score = max(0, min(score, 150))
+    if donor_id is not None:
+        _donor_scores[donor_id] = (today, score)
+    return score
+
+class AssignmentView:
+    """An assignment paired with its request record, without copying either dict"""
+    __slots__ = ('assignment', 'request')
+
+    def __init__(self, assignment, request):
+        self.assignment = assignment
+        self.request = request
+
+class AssignedDonorView:
+    """An assignment paired with its donor record, without copying either dict"""
+    __slots__ = ('assignment', 'donor')
+
+    def __init__(self, assignment, donor):
+        self.assignment = assignment
+        self.donor = donor
+
+class AvailableRequestView:
+    """An open request together with the units it still needs"""
+    __slots__ = ('request', 'remaining_units')
+
+    def __init__(self, request, remaining_units):
+        self.request = request
+        self.remaining_units = remaining_units
 
 def get_donor_assigned_requests(donor_id):
     """Get all requests assigned to a donor"""
     assigned = []
-    for assignment in donor_request_assignments.values():
-        if assignment['donor_id'] == donor_id and assignment['status'] in ['pending', 'accepted']:
+    for assignment_id in assignments_by_donor.get(donor_id, []):
+        assignment = donor_request_assignments[assignment_id]
+        if assignment['status'] in ['pending', 'accepted']:
             request_data = blood_requests_db.get(assignment['request_id'])
             if request_data:
-                assigned.append({
-                    **assignment,
-                    'request': request_data
-                })
+                assigned.append(AssignmentView(assignment, request_data))
     return assigned
 
 def get_request_assigned_donors(request_id):
     """Get all donors assigned to a request"""
     assigned = []
-    for assignment in donor_request_assignments.values():
-        if assignment['request_id'] == request_id:
-            donor_data = donors_db.get(assignment['donor_id'])
-            if donor_data:
-                assigned.append({
-                    **assignment,
-                    'donor': donor_data
-                })
+    for assignment_id in assignments_by_request.get(request_id, []):
+        assignment = donor_request_assignments[assignment_id]
+        donor_data = donors_db.get(assignment['donor_id'])
+        if donor_data:
+            assigned.append(AssignedDonorView(assignment, donor_data))
     return assigned
 
 def get_available_requests_for_donor(donor_id):
@@ -224,33 +1064,49 @@ def get_available_requests_for_donor(donor_id):
     
     donor_blood_group = donor['blood_group']
     # Get blood groups this donor can donate to
-    can_donate_to = BLOOD_COMPATIBILITY.get(donor_blood_group, [])
+    can_donate_to = DONATES_TO_MASK.get(donor_blood_group, 0)
+    
+    # Only requests that are still pending or partial, of a compatible blood group
+    open_ids = requests_by_status.get('pending', set()) | requests_by_status.get('partial', set())
+    candidate_ids = [request_id for request_id in open_ids
+                     if _request_bg_bits[request_id] & can_donate_to]
+    # Sort by urgency and date, using the keys precomputed when each request was indexed
+    candidate_ids.sort(key=_request_sort_keys.__getitem__)
     
     available_requests = []
-    for request_id, request_data in blood_requests_db.items():
-        # Check if request blood group is in the list this donor can donate to
-        if request_data['blood_group'] in can_donate_to:
-            # Check if request is still pending or partial
-            if request_data['status'] in ['pending', 'partial']:
-                # Check if this donor is not already assigned
-                already_assigned = any(
-                    a['donor_id'] == donor_id and a['request_id'] == request_id 
-                    for a in donor_request_assignments.values()
-                )
-                if not already_assigned:
-                    # Calculate remaining units needed
-                    remaining = request_data['units_needed'] - request_data.get('fulfilled_units', 0)
-                    available_requests.append({
-                        **request_data,
-                        'remaining_units': remaining
-                    })
-    
-    # Sort by urgency and date (guard against missing/None created_at)
-    urgency_order = {'critical': 0, 'high': 1, 'normal': 2}
-    available_requests.sort(key=lambda x: (urgency_order.get(x.get('urgency'), 2), x.get('created_at') or '1900-01-01'))
+    for request_id in candidate_ids:
+        request_data = blood_requests_db[request_id]
+        # Check if this donor is not already assigned
+        if (donor_id, request_id) not in assignment_by_pair:
+            # Calculate remaining units needed
+            remaining = request_data['units_needed'] - request_data.get('fulfilled_units', 0)
+            available_requests.append(AvailableRequestView(request_data, remaining))
     
     return available_requests
 
+def rank_compatible_donors(blood_group, location, today):
+    """Top 10 compatible donors with match scores, and how many were compatible"""
+    candidate_ids = get_compatible_donor_ids(blood_group, location)
+    total_compatible = len(candidate_ids)
+    
+    if np is not None and total_compatible >= VECTORIZE_MIN_DONORS:
+        top_donors = score_donors_vectorized(candidate_ids, today, 10)
+    else:
+        # Keep the 10 best by match score, most recent donation first among equal scores
+        top_ids = heapq.nlargest(10, candidate_ids, key=lambda donor_id: (
+            calculate_donor_eligibility(donors_db[donor_id], today),
+            _donor_sort_keys[donor_id]
+        ))
+        top_donors = []
+        for donor_id in top_ids:
+            donor = donors_db[donor_id]
+            top_donors.append({
+                **donor,
+                'match_score': calculate_donor_eligibility(donor, today),
+                'can_donate_now': can_donate(donor_last_donation_date(donor), today)
+            })
+    return top_donors, total_compatible
+
 def match_blood_request(request_data):
     """
     Blood matching algorithm
@@ -261,57 +1117,56 @@ def match_blood_request(request_data):
     location = request_data.get('location', '')
     urgency = request_data.get('urgency', 'normal')
     
-    # Get compatible donors
-    compatible_donors = get_compatible_donors(blood_group, location)
-    
-    # Calculate eligibility scores
-    scored_donors = []
-    for donor in compatible_donors:
-        score = calculate_donor_eligibility(donor)
-        scored_donors.append({
-            **donor,
-            'match_score': score,
-            'can_donate_now': can_donate(donor.get('last_donation'))
-        })
-    
-    # Sort by match score
-    scored_donors.sort(key=lambda x: x['match_score'], reverse=True)
+    # Ranking only depends on the donors, so it is reused until a donor changes
+    today = request_today()
+    top_donors, total_compatible = versioned(
+        'match', ('donors',), lambda: rank_compatible_donors(blood_group, location, today),
+        blood_group, location, today)
     
     # Check inventory first for exact match
-    inventory_available = blood_inventory.get(blood_group, {}).get('units', 0)
+    inv = blood_inventory.get(blood_group)
+    inventory_available = inv.get('units', 0) if inv else 0
     
     # Calculate remaining units needed
     remaining_units = units_needed - request_data.get('fulfilled_units', 0)
     
     return {
         'exact_match_inventory': inventory_available,
-        'compatible_donors': scored_donors[:10],  # Top 10 matches
-        'total_compatible': len(scored_donors),
-        'fulfillable': inventory_available >= remaining_units or len(scored_donors) > 0,
+        'compatible_donors': top_donors,
+        'total_compatible': total_compatible,
+        'fulfillable': inventory_available >= remaining_units or total_compatible > 0,
         'remaining_units': remaining_units
     }
 
 def update_inventory(blood_group, units, operation='add'):
     """Update blood inventory"""
-    if blood_group in blood_inventory:
+    inv = blood_inventory.get(blood_group)
+    if inv is not None:
         if operation == 'add':
-            blood_inventory[blood_group]['units'] += units
+            inv['units'] += units
         elif operation == 'remove':
-            blood_inventory[blood_group]['units'] = max(0, blood_inventory[blood_group]['units'] - units)
+            inv['units'] = max(0, inv['units'] - units)
+        # bump after the change, so nothing is cached under the new version from the old units
+        bump_version('inventory')
 
 def get_statistics():
-    """Get dashboard statistics"""
+    """Get dashboard statistics (reused until the data behind them changes)"""
+    return versioned('statistics', ('donors', 'requestors', 'requests', 'inventory'), compute_statistics)
+
+def compute_statistics():
+    """Compute dashboard statistics"""
     total_donors = len(donors_db)
     total_requestors = len(requestors_db)
     total_requests = len(blood_requests_db)
     
-    active_requests = sum(1 for r in blood_requests_db.values() if r['status'] in ['pending', 'partial'])
-    fulfilled_requests = sum(1 for r in blood_requests_db.values() if r['status'] == 'fulfilled')
+    # Request counts come straight from the status index, kept up to date on write
+    active_requests = len(requests_by_status.get('pending', ())) + len(requests_by_status.get('partial', ()))
+    fulfilled_requests = len(requests_by_status.get('fulfilled', ()))
     
     total_units_available = sum(inv['units'] for inv in blood_inventory.values())
     
-    # Critical blood groups (less than 20 units)
-    critical_groups = [bg for bg, inv in blood_inventory.items() if inv['units'] < 20]
+    # Critical blood groups (less than CRITICAL_UNITS units)
+    critical_groups = [bg for bg, inv in blood_inventory.items() if inv['units'] < CRITICAL_UNITS]
     
     return {
         'total_donors': total_donors,
@@ -335,25 +1190,19 @@ def get_eligible_donors_for_remaining(request_id):
         return []  # Request already fulfilled
     
     required_blood_group = request_data['blood_group']
+    today = request_today()
     eligible_donors = []
     
-    # Get all donors with matching blood group
-    for donor_id, donor in donors_db.items():
-        if donor['blood_group'] != required_blood_group:
-            continue  # Wrong blood group
-        
-        # Check if donor is available
-        if not donor.get('available', True) or donor.get('status') != 'active':
-            continue
+    # Get all available, active donors with matching blood group
+    candidate_ids = donors_by_bg.get(required_blood_group, set()) & available_active_donors
+    for donor_id in candidate_ids:
+        donor = donors_db[donor_id]
         
         # Check donation eligibility
-        can_donate_now = can_donate(donor.get('last_donation'))
+        can_donate_now = can_donate(donor_last_donation_date(donor), today)
         
         # Check if already assigned to this request
-        already_assigned = any(
-            a['donor_id'] == donor_id and a['request_id'] == request_id 
-            for a in donor_request_assignments.values()
-        )
+        already_assigned = (donor_id, request_id) in assignment_by_pair
         
         eligible_donors.append({
             'donor_id': donor_id,
@@ -378,41 +1227,29 @@ def get_matching_donors_for_request(request_id):
         return []
     
     matching_donors = []
-    for assignment in donor_request_assignments.values():
-        if assignment['request_id'] == request_id:
-            donor = donors_db.get(assignment['donor_id'])
-            if donor:
-                matching_donors.append({
-                    'assignment_id': assignment['assignment_id'],
-                    'donor_id': assignment['donor_id'],
-                    'donor_name': donor['name'],
-                    'blood_group': donor['blood_group'],
-                    'units_offered': assignment.get('units_offered', 0),
-                    'status': assignment.get('status', 'pending'),
-                    'phone': donor['phone']
-                })
+    for assignment_id in assignments_by_request.get(request_id, []):
+        assignment = donor_request_assignments[assignment_id]
+        donor = donors_db.get(assignment['donor_id'])
+        if donor:
+            matching_donors.append({
+                'assignment_id': assignment['assignment_id'],
+                'donor_id': assignment['donor_id'],
+                'donor_name': donor['name'],
+                'blood_group': donor['blood_group'],
+                'units_offered': assignment.get('units_offered', 0),
+                'status': assignment.get('status', 'pending'),
+                'phone': donor['phone']
+            })
     
     return matching_donors
 
 def get_fulfilled_history_for_request(request_id):
     """Get history of donations that fulfilled this request"""
-    fulfilled = []
     request_data = blood_requests_db.get(request_id)
     if not request_data:
         return []
     
-    for donation in donations_db.values():
-        if donation.get('request_id') == request_id and donation.get('status') == 'completed':
-            fulfilled.append({
-                'donation_id': donation['donation_id'],
-                'donor_name': donation.get('donor_name', 'Unknown'),
-                'blood_group': donation['blood_group'],
-                'units': donation['units'],
-                'donation_date': donation.get('donation_date', 'N/A'),
-                'hospital_name': donation.get('hospital_name', 'N/A')
-            })
-    
-    return fulfilled
+    return list(fulfilled_history_by_request.get(request_id, []))
 
 # ============== ROUTES ==============
 
@@ -420,11 +1257,7 @@ def get_fulfilled_history_for_request(request_id):
 def home():
     """Home page"""
     stats = get_statistics()
-    recent_requests = sorted(
-        blood_requests_db.values(), 
-        key=lambda x: (x.get('created_at') or ''), 
-        reverse=True
-    )[:5]
+    recent_requests = [blood_requests_db[request_id] for request_id in recent_request_ids]
     return render_template('index.html', stats=stats, recent_requests=recent_requests)
 
 @app.route('/about')
@@ -458,41 +1291,41 @@ def donor_register():
             'status': 'active',
             'total_donations': 0,
             'last_donation': None,
-            'registered_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'registered_at': timestamp(),
             'emergency_contact': request.form.get('emergency_contact', ''),
             'preferred_contact_time': request.form.get('preferred_contact_time', 'Anytime')
         }
         
         # Validate age
         if donor_data['age'] < 18 or donor_data['age'] > 65:
-            flash('Donor age must be between 18 and 65 years!', 'error')
+            flash_message('Donor age must be between 18 and 65 years!', 'error')
             return redirect(url_for('donor_register'))
         
         # Validate weight
         if donor_data['weight'] < 50:
-            flash('Donor weight must be at least 50kg!', 'error')
+            flash_message('Donor weight must be at least 50kg!', 'error')
             return redirect(url_for('donor_register'))
         
         donors_db[donor_id] = donor_data
+        _index_donor(donor_id)
         blood_group = donor_data['blood_group']
         
         # Update inventory donor list - REAL-TIME UPDATE
         if blood_group not in blood_inventory:
             blood_inventory[blood_group] = {'units': 0, 'donors': []}
         
-        if donor_id not in blood_inventory[blood_group]['donors']:
-            blood_inventory[blood_group]['donors'].append(donor_id)
+        add_inventory_donor(blood_group, donor_id)
         
         # SAVE DATA PERSISTENTLY
-        save_json_file(DONORS_FILE, donors_db)
-        save_json_file(INVENTORY_FILE, blood_inventory)
+        mark_dirty('donors', donor_id)
+        mark_dirty('inventory', blood_group)
         
         # Log the registration with timestamp for real-time updates
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        current_time = timestamp()
         print(f"[{current_time}] New donor registered: {donor_id} ({blood_group})")
         print(f"[{current_time}] Donor count for {blood_group}: {len(blood_inventory[blood_group]['donors'])}")
         
-        flash(f'✓ Registration successful! Your Donor ID is: {donor_id}', 'success')
+        flash_message(f'✓ Registration successful! Your Donor ID is: {donor_id}', 'success')
         return redirect(url_for('donor_dashboard', donor_id=donor_id))
     
     return render_template('donor_register.html')
@@ -502,16 +1335,14 @@ def donor_dashboard(donor_id):
     """Donor dashboard"""
     donor = donors_db.get(donor_id)
     if not donor:
-        flash('Donor not found!', 'error')
+        flash_message('Donor not found!', 'error')
         return redirect(url_for('home'))
     
     # Get donation history - ENHANCED for Feature 3
-    donation_history = [d for d in donations_db.values() if d['donor_id'] == donor_id]
-    # Sort by date (newest first)
-    donation_history.sort(key=lambda x: x.get('donation_date', ''), reverse=True)
+    donation_history = [donations_db[donation_id] for donation_id in donations_by_donor.get(donor_id, [])]
     
     # Check eligibility
-    can_donate_now = can_donate(donor.get('last_donation'))
+    can_donate_now = can_donate(donor_last_donation_date(donor))
     
     # Get assigned requests
     assigned_requests = get_donor_assigned_requests(donor_id)
@@ -535,10 +1366,10 @@ def donor_login():
         donor = donors_db.get(donor_id)
         if donor and donor['email'] == email:
             session['donor_id'] = donor_id
-            flash('Login successful!', 'success')
+            flash_message('Login successful!', 'success')
             return redirect(url_for('donor_dashboard', donor_id=donor_id))
         else:
-            flash('Invalid Donor ID or Email!', 'error')
+            flash_message('Invalid Donor ID or Email!', 'error')
     
     return render_template('donor_login.html')
 
@@ -547,7 +1378,7 @@ def donor_update(donor_id):
     """Update donor information"""
     donor = donors_db.get(donor_id)
     if not donor:
-        flash('Donor not found!', 'error')
+        flash_message('Donor not found!', 'error')
         return redirect(url_for('home'))
     
     donor['phone'] = request.form.get('phone', donor['phone'])
@@ -555,8 +1386,9 @@ def donor_update(donor_id):
     donor['available'] = request.form.get('available') == 'on'
     donor['city'] = request.form.get('city', donor['city'])
     donor['state'] = request.form.get('state', donor['state'])
+    _index_donor(donor_id)
     
-    flash('Profile updated successfully!', 'success')
+    flash_message('Profile updated successfully!', 'success')
     return redirect(url_for('donor_dashboard', donor_id=donor_id))
 
 @app.route('/donor/donate/<donor_id>', methods=['POST'])
@@ -564,11 +1396,11 @@ def record_donation(donor_id):
     """Record a new donation"""
     donor = donors_db.get(donor_id)
     if not donor:
-        flash('Donor not found!', 'error')
+        flash_message('Donor not found!', 'error')
         return redirect(url_for('home'))
     
-    if not can_donate(donor.get('last_donation')):
-        flash('You must wait 56 days between donations!', 'error')
+    if not can_donate(donor_last_donation_date(donor)):
+        flash_message('You must wait 56 days between donations!', 'error')
         return redirect(url_for('donor_dashboard', donor_id=donor_id))
     
     donation_id = generate_donation_id()
@@ -580,26 +1412,29 @@ def record_donation(donor_id):
         'donor_name': donor['name'],
         'blood_group': donor['blood_group'],
         'units': units,
-        'donation_date': datetime.now().strftime('%Y-%m-%d'),
+        'donation_date': timestamp('%Y-%m-%d'),
         'donation_center': request.form.get('donation_center', 'Main Center'),
         'notes': request.form.get('notes', '')
     }
     
     donations_db[donation_id] = donation_data
+    _index_donation(donation_id)
     
     # Update donor record
     donor['last_donation'] = donation_data['donation_date']
     donor['total_donations'] += 1
+    _index_donor(donor_id)
     
     # Update inventory
     update_inventory(donor['blood_group'], units, 'add')
     
     # SAVE DATA PERSISTENTLY
-    save_json_file(DONATIONS_FILE, donations_db)
-    save_json_file(DONORS_FILE, donors_db)
-    save_json_file(INVENTORY_FILE, blood_inventory)
+    mark_dirty('donations', donation_id)
+    mark_dirty('donors', donor_id)
+    if donor['blood_group'] in blood_inventory:
+        mark_dirty('inventory', donor['blood_group'])
     
-    flash(f'Donation recorded successfully! Donation ID: {donation_id}', 'success')
+    flash_message(f'Donation recorded successfully! Donation ID: {donation_id}', 'success')
     return redirect(url_for('donor_dashboard', donor_id=donor_id))
 
 # ============== FEATURE 1: DONATE DIRECTLY TO INVENTORY ==============
@@ -609,13 +1444,13 @@ def donate_to_inventory(donor_id):
     """Allow donor to donate blood directly to inventory"""
     donor = donors_db.get(donor_id)
     if not donor:
-        flash('Donor not found!', 'error')
+        flash_message('Donor not found!', 'error')
         return redirect(url_for('home'))
     
     if request.method == 'POST':
         # Check eligibility
-        if not can_donate(donor.get('last_donation')):
-            flash('You must wait 56 days between donations!', 'error')
+        if not can_donate(donor_last_donation_date(donor)):
+            flash_message('You must wait 56 days between donations!', 'error')
             return redirect(url_for('donate_to_inventory', donor_id=donor_id))
         
         # Get form data
@@ -626,7 +1461,7 @@ def donate_to_inventory(donor_id):
         
         # Validate units
         if units <= 0 or units > 50:
-            flash('Units must be between 1 and 50!', 'error')
+            flash_message('Units must be between 1 and 50!', 'error')
             return redirect(url_for('donate_to_inventory', donor_id=donor_id))
         
         # Create donation record
@@ -637,7 +1472,7 @@ def donate_to_inventory(donor_id):
             'donor_name': donor['name'],
             'blood_group': blood_group,
             'units': units,
-            'donation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'donation_date': timestamp(),
             'donation_center': donation_center,
             'notes': notes,
             'requestor_id': 'inventory',  # Mark as inventory donation
@@ -648,28 +1483,29 @@ def donate_to_inventory(donor_id):
         
         # Add donation
         donations_db[donation_id] = donation_data
+        _index_donation(donation_id)
         
         # Update donor record
-        donor['last_donation'] = datetime.now().strftime('%Y-%m-%d')
+        donor['last_donation'] = timestamp('%Y-%m-%d')
         donor['total_donations'] = donor.get('total_donations', 0) + 1
+        _index_donor(donor_id)
         
         # Update inventory - ADD units
         update_inventory(blood_group, units, 'add')
         
         # Add donor to blood group donors list if not already there
-        if donor_id not in blood_inventory[blood_group]['donors']:
-            blood_inventory[blood_group]['donors'].append(donor_id)
+        add_inventory_donor(blood_group, donor_id)
         
         # SAVE PERSISTENTLY
-        save_json_file(DONATIONS_FILE, donations_db)
-        save_json_file(DONORS_FILE, donors_db)
-        save_json_file(INVENTORY_FILE, blood_inventory)
+        mark_dirty('donations', donation_id)
+        mark_dirty('donors', donor_id)
+        mark_dirty('inventory', blood_group)
         
-        flash(f'✓ Successfully donated {units} unit(s) of {blood_group} to inventory! Donation ID: {donation_id}', 'success')
+        flash_message(f'✓ Successfully donated {units} unit(s) of {blood_group} to inventory! Donation ID: {donation_id}', 'success')
         return redirect(url_for('donor_dashboard', donor_id=donor_id))
     
     # GET request - show form
-    can_donate_now = can_donate(donor.get('last_donation'))
+    can_donate_now = can_donate(donor_last_donation_date(donor))
     return render_template('donor_donate_inventory.html', donor=donor, can_donate_now=can_donate_now)
 
 # ============== NEW: DONOR ACCEPT REQUEST FLOW ==============
@@ -681,7 +1517,7 @@ def donor_accept_request(donor_id, request_id):
     request_data = blood_requests_db.get(request_id)
     
     if not donor or not request_data:
-        flash('Invalid donor or request!', 'error')
+        flash_message('Invalid donor or request!', 'error')
         return redirect(url_for('home'))
     
     # Create assignment
@@ -694,17 +1530,18 @@ def donor_accept_request(donor_id, request_id):
         'request_id': request_id,
         'units_offered': units_offered,
         'status': 'accepted',
-        'accepted_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'accepted_at': timestamp(),
         'donated_at': None,
         'notes': request.form.get('notes', '')
     }
     
     donor_request_assignments[assignment_id] = assignment_data
+    _index_assignment(assignment_data)
     
     # SAVE DATA PERSISTENTLY
-    save_json_file(ASSIGNMENTS_FILE, donor_request_assignments)
+    mark_dirty('assignments', assignment_id)
     
-    flash(f'You have accepted the request! Assignment ID: {assignment_id}', 'success')
+    flash_message(f'You have accepted the request! Assignment ID: {assignment_id}', 'success')
     return redirect(url_for('donor_dashboard', donor_id=donor_id))
 
 @app.route('/donor/confirm-donation/<assignment_id>', methods=['POST'])
@@ -712,7 +1549,7 @@ def donor_confirm_donation(assignment_id):
     """Donor confirms they have donated for an assigned request"""
     assignment = donor_request_assignments.get(assignment_id)
     if not assignment:
-        flash('Assignment not found!', 'error')
+        flash_message('Assignment not found!', 'error')
         return redirect(url_for('home'))
     
     donor_id = assignment['donor_id']
@@ -722,7 +1559,7 @@ def donor_confirm_donation(assignment_id):
     request_data = blood_requests_db.get(request_id)
     
     if not donor or not request_data:
-        flash('Invalid data!', 'error')
+        flash_message('Invalid data!', 'error')
         return redirect(url_for('donor_dashboard', donor_id=donor_id))
     
     units_donated = int(request.form.get('units_donated', assignment['units_offered']))
@@ -730,27 +1567,32 @@ def donor_confirm_donation(assignment_id):
     # Update assignment
     assignment['status'] = 'completed'
     assignment['units_donated'] = units_donated
-    assignment['donated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    assignment['donated_at'] = timestamp()
     
     # Update request fulfilled units
-    request_data['fulfilled_units'] = request_data.get('fulfilled_units', 0) + units_donated
+    fulfilled = request_data.get('fulfilled_units', 0) + units_donated
+    request_data['fulfilled_units'] = fulfilled
     
     # Update request status
-    remaining = request_data['units_needed'] - request_data['fulfilled_units']
+    remaining = request_data['units_needed'] - fulfilled
     if remaining <= 0:
         request_data['status'] = 'fulfilled'
     else:
         request_data['status'] = 'partial'
+    _index_request(request_id)
     
     # Update blood inventory - CONSUME units from inventory
     blood_group = donor['blood_group']
-    if blood_group in blood_inventory:
-        blood_inventory[blood_group]['units'] = max(0, blood_inventory[blood_group]['units'] - units_donated)
+    inv = blood_inventory.get(blood_group)
+    if inv is not None:
+        inv['units'] = max(0, inv['units'] - units_donated)
+        bump_version('inventory')
         request_data['inventory_used'] = request_data.get('inventory_used', 0) + units_donated
     
     # Update donor stats
-    donor['last_donation'] = datetime.now().strftime('%Y-%m-%d')
+    donor['last_donation'] = timestamp('%Y-%m-%d')
     donor['total_donations'] = donor.get('total_donations', 0) + 1
+    _index_donor(donor_id)
     
     # Create donation record
     donation_id = generate_donation_id()
@@ -762,22 +1604,24 @@ def donor_confirm_donation(assignment_id):
         'patient_name': request_data['patient_name'],
         'blood_group': donor['blood_group'],
         'units': units_donated,
-        'donation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'donation_date': timestamp(),
         'donation_center': request.form.get('donation_center', request_data['hospital_name']),
         'notes': f'Donation for request {request_id}',
         'assignment_id': assignment_id,
         'status': 'completed'
     }
     donations_db[donation_id] = donation_data
+    _index_donation(donation_id)
     
     # SAVE DATA PERSISTENTLY
-    save_json_file(DONATIONS_FILE, donations_db)
-    save_json_file(DONORS_FILE, donors_db)
-    save_json_file(BLOOD_REQUESTS_FILE, blood_requests_db)
-    save_json_file(ASSIGNMENTS_FILE, donor_request_assignments)
-    save_json_file(INVENTORY_FILE, blood_inventory)
+    mark_dirty('donations', donation_id)
+    mark_dirty('donors', donor_id)
+    mark_dirty('requests', request_id)
+    mark_dirty('assignments', assignment_id)
+    if blood_group in blood_inventory:
+        mark_dirty('inventory', blood_group)
     
-    flash(f'Donation confirmed! {units_donated} unit(s) donated. Remaining needed: {max(0, remaining)}', 'success')
+    flash_message(f'Donation confirmed! {units_donated} unit(s) donated. Remaining needed: {max(0, remaining)}', 'success')
     return redirect(url_for('donor_dashboard', donor_id=donor_id))
 
 # ============== FEATURE 3: REQUESTOR CONFIRM DONOR ==============
@@ -787,7 +1631,7 @@ def requestor_confirm_donor(requestor_id, assignment_id):
     """Requestor confirms acceptance of blood from a donor"""
     assignment = donor_request_assignments.get(assignment_id)
     if not assignment:
-        flash('Assignment not found!', 'error')
+        flash_message('Assignment not found!', 'error')
         return redirect(url_for('home'))
     
     requestor = requestors_db.get(requestor_id)
@@ -797,17 +1641,17 @@ def requestor_confirm_donor(requestor_id, assignment_id):
     donor = donors_db.get(donor_id)
     
     if not requestor or not request_data or not donor:
-        flash('Invalid data!', 'error')
+        flash_message('Invalid data!', 'error')
         return redirect(url_for('requestor_dashboard', requestor_id=requestor_id))
     
     # Update assignment status to confirmed
     assignment['status'] = 'requestor_confirmed'
-    assignment['confirmed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    assignment['confirmed_at'] = timestamp()
     
     # SAVE PERSISTENTLY
-    save_json_file(ASSIGNMENTS_FILE, donor_request_assignments)
+    mark_dirty('assignments', assignment_id)
     
-    flash(f'✓ You have confirmed blood reception from {donor["name"]}! They will proceed with donation.', 'success')
+    flash_message(f'✓ You have confirmed blood reception from {donor["name"]}! They will proceed with donation.', 'success')
     return redirect(url_for('requestor_dashboard', requestor_id=requestor_id))
 
 # ============== REQUESTOR ROUTES ==============
@@ -828,16 +1672,16 @@ def requestor_register():
             'city': request.form['city'],
             'state': request.form['state'],
             'pincode': request.form['pincode'],
-            'registered_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'registered_at': timestamp(),
             'total_requests': 0
         }
         
         requestors_db[requestor_id] = requestor_data
         
         # SAVE DATA PERSISTENTLY
-        save_json_file(REQUESTORS_FILE, requestors_db)
+        mark_dirty('requestors', requestor_id)
         
-        flash(f'Registration successful! Your Requestor ID is: {requestor_id}', 'success')
+        flash_message(f'Registration successful! Your Requestor ID is: {requestor_id}', 'success')
         return redirect(url_for('requestor_dashboard', requestor_id=requestor_id))
     
     return render_template('requestor_register.html')
@@ -847,27 +1691,25 @@ def requestor_dashboard(requestor_id):
     """Requestor dashboard"""
     requestor = requestors_db.get(requestor_id)
     if not requestor:
-        flash('Requestor not found!', 'error')
+        flash_message('Requestor not found!', 'error')
         return redirect(url_for('home'))
     
     # Get request history with assigned donors - ENHANCED FOR FEATURES 2, 4, 5
+    # (requests_by_requestor is already newest first)
     request_history = []
-    for req in blood_requests_db.values():
-        if req['requestor_id'] == requestor_id:
-            assigned_donors = get_request_assigned_donors(req['request_id'])
-            fulfilled_history = get_fulfilled_history_for_request(req['request_id'])
-            eligible_donors = get_eligible_donors_for_remaining(req['request_id'])
-            
-            request_history.append({
-                **req,
-                'assigned_donors': assigned_donors,
-                'fulfilled_history': fulfilled_history,
-                'eligible_donors': eligible_donors,
-                'remaining_units': req['units_needed'] - req.get('fulfilled_units', 0)
-            })
-    
-    # Sort by date (guard against missing/None created_at)
-    request_history.sort(key=lambda x: (x.get('created_at') or ''), reverse=True)
+    for request_id in requests_by_requestor.get(requestor_id, []):
+        req = blood_requests_db[request_id]
+        assigned_donors = get_request_assigned_donors(request_id)
+        fulfilled_history = get_fulfilled_history_for_request(request_id)
+        eligible_donors = get_eligible_donors_for_remaining(request_id)
+        
+        request_history.append({
+            **req,
+            'assigned_donors': assigned_donors,
+            'fulfilled_history': fulfilled_history,
+            'eligible_donors': eligible_donors,
+            'remaining_units': req['units_needed'] - req.get('fulfilled_units', 0)
+        })
     
     return render_template('requestor_dashboard.html', requestor=requestor, 
                           request_history=request_history)
@@ -879,7 +1721,7 @@ def take_from_inventory(requestor_id):
     """Allow requestor to take blood from inventory"""
     requestor = requestors_db.get(requestor_id)
     if not requestor:
-        flash('Requestor not found!', 'error')
+        flash_message('Requestor not found!', 'error')
         return redirect(url_for('home'))
     
     if request.method == 'POST':
@@ -887,22 +1729,22 @@ def take_from_inventory(requestor_id):
         units_needed = int(request.form.get('units_needed', 1))
         hospital_name = request.form.get('hospital_name', requestor.get('organization', 'Hospital'))
         reason = request.form.get('reason', '')
-        required_date = request.form.get('required_date', datetime.now().strftime('%Y-%m-%d'))
+        required_date = request.form.get('required_date', timestamp('%Y-%m-%d'))
         
         # Validate blood group
         if blood_group not in blood_inventory:
-            flash('Invalid blood group!', 'error')
+            flash_message('Invalid blood group!', 'error')
             return redirect(url_for('take_from_inventory', requestor_id=requestor_id))
         
         # Validate units
         if units_needed <= 0:
-            flash('Units must be greater than 0!', 'error')
+            flash_message('Units must be greater than 0!', 'error')
             return redirect(url_for('take_from_inventory', requestor_id=requestor_id))
         
         # Check inventory availability
         available_units = blood_inventory[blood_group]['units']
         if available_units < units_needed:
-            flash(f'❌ Only {available_units} unit(s) of {blood_group} available! You requested {units_needed} units.', 'error')
+            flash_message(f'❌ Only {available_units} unit(s) of {blood_group} available! You requested {units_needed} units.', 'error')
             return redirect(url_for('take_from_inventory', requestor_id=requestor_id))
         
         # Create a blood request for inventory withdrawal
@@ -928,12 +1770,13 @@ def take_from_inventory(requestor_id):
             'required_date': required_date,
             'reason': reason or 'Direct inventory request',
             'status': 'fulfilled',
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'created_at': timestamp(),
             'type': 'inventory_withdrawal'
         }
         
         # Add to blood requests
         blood_requests_db[request_id] = blood_request_data
+        _index_request(request_id)
         
         # Deduct from inventory
         update_inventory(blood_group, units_needed, 'remove')
@@ -952,19 +1795,21 @@ def take_from_inventory(requestor_id):
             'request_id': request_id,
             'patient_name': blood_request_data['patient_name'],
             'hospital_name': hospital_name,
-            'donation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'donation_date': timestamp(),
             'status': 'completed',
             'notes': f'Direct withdrawal from inventory. Reason: {reason}'
         }
         donations_db[donation_id] = donation_data
+        _index_donation(donation_id)
         
         # SAVE PERSISTENTLY
-        save_json_file(BLOOD_REQUESTS_FILE, blood_requests_db)
-        save_json_file(INVENTORY_FILE, blood_inventory)
-        save_json_file(REQUESTORS_FILE, requestors_db)
-        save_json_file(DONATIONS_FILE, donations_db)
+        # Inventory withdrawals are not acknowledged until they are on disk
+        mark_dirty('requests', request_id, sync=True)
+        mark_dirty('inventory', blood_group, sync=True)
+        mark_dirty('requestors', requestor_id, sync=True)
+        mark_dirty('donations', donation_id, sync=True)
         
-        flash(f'✓ Successfully withdrew {units_needed} unit(s) of {blood_group} from inventory! Request ID: {request_id}', 'success')
+        flash_message(f'✓ Successfully withdrew {units_needed} unit(s) of {blood_group} from inventory! Request ID: {request_id}', 'success')
         return redirect(url_for('requestor_dashboard', requestor_id=requestor_id))
     
     # GET request - show form
@@ -980,10 +1825,10 @@ def requestor_login():
         requestor = requestors_db.get(requestor_id)
         if requestor and requestor['email'] == email:
             session['requestor_id'] = requestor_id
-            flash('Login successful!', 'success')
+            flash_message('Login successful!', 'success')
             return redirect(url_for('requestor_dashboard', requestor_id=requestor_id))
         else:
-            flash('Invalid Requestor ID or Email!', 'error')
+            flash_message('Invalid Requestor ID or Email!', 'error')
     
     return render_template('requestor_login.html')
 
@@ -1015,13 +1860,14 @@ def request_blood():
             'required_date': request.form['required_date'],
             'reason': request.form.get('reason', ''),
             'status': 'pending',
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'created_at': timestamp(),
             'matched_donors': [],
             'fulfilled_units': 0,
             'inventory_used': 0
         }
         
         blood_requests_db[request_id] = request_data
+        _index_request(request_id)
         
         # Update requestor stats if registered
         requestor_id = request_data['requestor_id']
@@ -1033,10 +1879,11 @@ def request_blood():
         blood_requests_db[request_id]['matched_donors'] = [d['donor_id'] for d in match_results['compatible_donors']]
         
         # SAVE DATA PERSISTENTLY
-        save_json_file(BLOOD_REQUESTS_FILE, blood_requests_db)
-        save_json_file(REQUESTORS_FILE, requestors_db)
+        mark_dirty('requests', request_id)
+        if requestor_id in requestors_db:
+            mark_dirty('requestors', requestor_id)
         
-        flash(f'Blood request created! Request ID: {request_id}', 'success')
+        flash_message(f'Blood request created! Request ID: {request_id}', 'success')
         return redirect(url_for('request_details', request_id=request_id))
     
     return render_template('request_blood.html')
@@ -1046,7 +1893,7 @@ def request_details(request_id):
     """View request details with matched donors"""
     request_data = blood_requests_db.get(request_id)
     if not request_data:
-        flash('Request not found!', 'error')
+        flash_message('Request not found!', 'error')
         return redirect(url_for('home'))
     
     # Get fresh match results
@@ -1075,34 +1922,34 @@ def search_donors():
         
         search_performed = True
         
-        for donor in donors_db.values():
-            match = True
-            
-            if blood_group and donor['blood_group'] != blood_group:
-                match = False
-            
-            if location:
-                loc_match = (location.lower() in donor.get('city', '').lower() or 
-                           location.lower() in donor.get('state', '').lower() or
-                           location.lower() in donor.get('pincode', ''))
-                if not loc_match:
-                    match = False
-            
-            if match and donor['available'] and donor['status'] == 'active':
-                results.append(donor)
+        # Repeated searches are answered from cache until a donor changes
+        results = versioned('search_donors', ('donors',), lambda: find_donors(blood_group, location),
+                            blood_group, location)
     
     return render_template('search_donors.html', results=results, 
                           search_performed=search_performed)
 
+def find_donors(blood_group, location):
+    """Available active donors matching the search form, in registration order"""
+    matched = available_active_donors
+    if blood_group:
+        matched = matched & donors_by_bg.get(blood_group, set())
+    if location:
+        matched = matched & donors_matching_location(location, include_pincode=True)
+    return [donors_db[donor_id] for donor_id in in_registration_order(matched)]
+
 @app.route('/blood-inventory')
 def blood_inventory_view():
     """View blood inventory with transaction history"""
+    return render_cached('blood_inventory_view', ('donors', 'requestors', 'requests', 'inventory', 'donations'),
+                         render_blood_inventory)
+
+def render_blood_inventory():
     stats = get_statistics()
     
-    # Get recent donation transactions (sorted by date descending)
-    donation_transactions = list(donations_db.values())
-    donation_transactions.sort(key=lambda x: x.get('donation_date', ''), reverse=True)
-    donation_transactions = donation_transactions[:50]  # Show last 50 transactions
+    # Get recent donation transactions (latest 50, by date descending)
+    donation_transactions = versioned('inventory_transactions', ('donations',), lambda: heapq.nlargest(
+        50, donations_db.values(), key=lambda x: x.get('donation_date', '')))
     
     return render_template('blood_inventory.html', inventory=blood_inventory, stats=stats, 
                          donation_transactions=donation_transactions)
@@ -1114,34 +1961,37 @@ def use_inventory_for_request(request_id):
     """Use blood inventory to fulfill a request"""
     request_data = blood_requests_db.get(request_id)
     if not request_data:
-        flash('Request not found!', 'error')
+        flash_message('Request not found!', 'error')
         return redirect(url_for('home'))
     
     blood_group = request_data['blood_group']
     units_from_inventory = int(request.form.get('units_from_inventory', 0))
     
     # Check if inventory has enough
-    available = blood_inventory.get(blood_group, {}).get('units', 0)
+    inv = blood_inventory.get(blood_group)
+    available = inv.get('units', 0) if inv else 0
     
     if units_from_inventory > available:
-        flash(f'Not enough inventory! Available: {available} units', 'error')
+        flash_message(f'Not enough inventory! Available: {available} units', 'error')
         return redirect(url_for('request_details', request_id=request_id))
     
     # Update inventory
     update_inventory(blood_group, units_from_inventory, 'remove')
     
     # Update request
-    request_data['fulfilled_units'] = request_data.get('fulfilled_units', 0) + units_from_inventory
+    fulfilled = request_data.get('fulfilled_units', 0) + units_from_inventory
+    request_data['fulfilled_units'] = fulfilled
     request_data['inventory_used'] = request_data.get('inventory_used', 0) + units_from_inventory
     
     # Update status
-    remaining = request_data['units_needed'] - request_data['fulfilled_units']
+    remaining = request_data['units_needed'] - fulfilled
     if remaining <= 0:
         request_data['status'] = 'fulfilled'
-        flash(f'Request fully fulfilled using {units_from_inventory} unit(s) from inventory!', 'success')
+        flash_message(f'Request fully fulfilled using {units_from_inventory} unit(s) from inventory!', 'success')
     else:
         request_data['status'] = 'partial'
-        flash(f'{units_from_inventory} unit(s) used from inventory. Remaining needed: {remaining}', 'info')
+        flash_message(f'{units_from_inventory} unit(s) used from inventory. Remaining needed: {remaining}', 'info')
+    _index_request(request_id)
     
     return redirect(url_for('request_details', request_id=request_id))
 
@@ -1154,29 +2004,65 @@ def confirm_donor_for_request(request_id, assignment_id):
     assignment = donor_request_assignments.get(assignment_id)
     
     if not request_data or not assignment:
-        flash('Invalid request or assignment!', 'error')
+        flash_message('Invalid request or assignment!', 'error')
         return redirect(url_for('home'))
     
     # Update assignment status
     assignment['status'] = 'confirmed_by_requestor'
-    assignment['confirmed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    assignment['confirmed_at'] = timestamp()
+    bump_version('assignments')
     
-    flash('Donor confirmed! Waiting for donor to complete the donation.', 'success')
+    flash_message('Donor confirmed! Waiting for donor to complete the donation.', 'success')
     return redirect(url_for('request_details', request_id=request_id))
 
 # ============== ADMIN/UTILITY ROUTES ==============
 
+ADMIN_LIST_LIMIT = 200   # newest requests/donations passed to the admin dashboard
+STREAM_CHUNK_ROWS = 256  # records encoded per chunk of a streamed JSON list
+
+def _encode_rows(rows):
+    """Encode a list of records the way jsonify() would (sorted keys, compact)"""
+    if orjson is not None:
+        return orjson.dumps(rows, default=app.json.default,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(rows, default=app.json.default, sort_keys=True,
+                      separators=(',', ':')).encode()
+
+def stream_json_list(records):
+    """JSON array response whose body is encoded chunk by chunk as it is sent
+
+    The records are snapshotted up front (references only) so writes to the
+    store while the body streams cannot break the iteration. When jsonify()
+    would pretty-print (debug mode, or compact=False) the response is left
+    to it, so the body stays identical to the unstreamed one.
+    """
+    rows = list(records)
+    if (app.json.compact is None and app.debug) or app.json.compact is False:
+        return jsonify(rows)
+
+    def generate():
+        yield b'['
+        for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+            encoded = _encode_rows(rows[start:start + STREAM_CHUNK_ROWS])
+            yield (b',' if start else b'') + encoded[1:-1]
+        yield b']\n'
+
+    return app.response_class(generate(), mimetype=app.json.mimetype)
+
 @app.route('/dashboard')
 def admin_dashboard():
     """Admin dashboard"""
+    return render_cached('admin_dashboard', tuple(PERSISTED_STORES), render_admin_dashboard)
+
+def render_admin_dashboard():
     stats = get_statistics()
     
-    # Get all data for admin view
+    # Get all data for admin view (the newest-first lists are reused until the store changes)
     all_donors = list(donors_db.values())
-    all_requests = sorted(blood_requests_db.values(), 
-                         key=lambda x: (x.get('created_at') or ''), reverse=True)
-    all_donations = sorted(donations_db.values(),
-                          key=lambda x: (x.get('donation_date') or ''), reverse=True)
+    all_requests = versioned('admin_requests', ('requests',), lambda: heapq.nlargest(
+        ADMIN_LIST_LIMIT, blood_requests_db.values(), key=lambda x: (x.get('created_at') or '')))
+    all_donations = versioned('admin_donations', ('donations',), lambda: heapq.nlargest(
+        ADMIN_LIST_LIMIT, donations_db.values(), key=lambda x: (x.get('donation_date') or '')))
     all_assignments = list(donor_request_assignments.values())
     
     return render_template('admin_dashboard.html', stats=stats, 
@@ -1191,12 +2077,12 @@ def api_statistics():
 @app.route('/api/donors')
 def api_donors():
     """API endpoint for donors"""
-    return jsonify(list(donors_db.values()))
+    return stream_json_list(donors_db.values())
 
 @app.route('/api/requests')
 def api_requests():
     """API endpoint for blood requests"""
-    return jsonify(list(blood_requests_db.values()))
+    return stream_json_list(blood_requests_db.values())
 
 @app.route('/api/inventory/real-time')
 def api_inventory_realtime():
@@ -1204,50 +2090,77 @@ def api_inventory_realtime():
     Real-time API endpoint for inventory data
     Returns inventory with donor counts and compatibility info
     """
-    inventory_data = {}
-    for blood_group, inv_data in blood_inventory.items():
-        # Get compatible blood groups for donors
-        can_donate_to = BLOOD_COMPATIBILITY.get(blood_group, [])
-        can_receive_from = RECEIVE_COMPATIBILITY.get(blood_group, [])
-        
-        inventory_data[blood_group] = {
-            'units': inv_data.get('units', 0),
-            'donor_count': len(inv_data.get('donors', [])),
-            'donor_ids': inv_data.get('donors', []),
-            'can_donate_to': can_donate_to,
-            'can_receive_from': can_receive_from,
-            'status': 'critical' if inv_data.get('units', 0) < 20 else ('low' if inv_data.get('units', 0) < 40 else 'adequate')
-        }
+    return conditional_response(('donors', 'inventory'), build_inventory_realtime_response)
+
+def build_inventory_realtime_response():
+    summary = versioned('inventory_summary', ('inventory',), build_inventory_summary)
     
     return jsonify({
         'success': True,
-        'timestamp': datetime.now().isoformat(),
-        'inventory': inventory_data,
-        'total_units': sum(inv['units'] for inv in blood_inventory.values()),
+        'timestamp': request_now().isoformat(),
+        'inventory': summary['realtime'],
+        'total_units': summary['total_units'],
         'total_donors': len(donors_db),
-        'critical_groups': [bg for bg, inv in blood_inventory.items() if inv.get('units', 0) < 20]
+        'critical_groups': summary['critical_groups']
     })
 
+def inventory_status(units):
+    """Stock level label for a blood group's unit count"""
+    if units < CRITICAL_UNITS:
+        return 'critical'
+    return 'low' if units < LOW_UNITS else 'adequate'
+
+def build_inventory_summary():
+    """Everything the inventory polling endpoints report, in one pass over the groups"""
+    realtime = {}
+    breakdown = {}
+    total_units = 0
+    critical_groups = []
+    for blood_group, inv_data in blood_inventory.items():
+        units = inv_data.get('units', 0)
+        donor_ids = inv_data.get('donors', [])
+        status = inventory_status(units)
+        total_units += units
+        if status == 'critical':
+            critical_groups.append(blood_group)
+        realtime[blood_group] = {
+            'units': units,
+            'donor_count': len(donor_ids),
+            'donor_ids': donor_ids,
+            'can_donate_to': BLOOD_COMPATIBILITY.get(blood_group, ()),
+            'can_receive_from': RECEIVE_COMPATIBILITY.get(blood_group, ()),
+            'status': status
+        }
+        breakdown[blood_group] = {
+            'units': units,
+            'donors': len(donor_ids),
+            'status': status
+        }
+    return {
+        'realtime': realtime,
+        'breakdown': breakdown,
+        'total_units': total_units,
+        'critical_groups': critical_groups
+    }
+
 @app.route('/api/dashboard/stats')
 def api_dashboard_stats():
     """
     Real-time API endpoint for dashboard statistics
     Updates whenever data changes
     """
+    return conditional_response(('donors', 'requestors', 'requests', 'inventory'),
+                                build_dashboard_stats_response)
+
+def build_dashboard_stats_response():
     stats = get_statistics()
     
     # Add inventory breakdown by blood group
-    inventory_breakdown = {}
-    for blood_group, inv_data in blood_inventory.items():
-        inventory_breakdown[blood_group] = {
-            'units': inv_data.get('units', 0),
-            'donors': len(inv_data.get('donors', [])),
-            'status': 'critical' if inv_data.get('units', 0) < 20 else ('low' if inv_data.get('units', 0) < 40 else 'adequate')
-        }
+    inventory_breakdown = versioned('inventory_summary', ('inventory',), build_inventory_summary)['breakdown']
     
     return jsonify({
         'success': True,
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': request_now().isoformat(),
         'stats': stats,
         'inventory_breakdown': inventory_breakdown
     })
@@ -1264,9 +2177,8 @@ def api_update_inventory_for_donor(donor_id):
     
     blood_group = donor.get('blood_group')
     # Ensure donor is in the inventory list
-    if donor_id not in blood_inventory[blood_group]['donors']:
-        blood_inventory[blood_group]['donors'].append(donor_id)
-        save_json_file(INVENTORY_FILE, blood_inventory)
+    if add_inventory_donor(blood_group, donor_id):
+        mark_dirty('inventory', blood_group)
     
     return jsonify({
         'success': True,
@@ -1281,20 +2193,23 @@ def fulfill_request(request_id):
     """Mark request as fulfilled (legacy route)"""
     request_data = blood_requests_db.get(request_id)
     if not request_data:
-        flash('Request not found!', 'error')
+        flash_message('Request not found!', 'error')
         return redirect(url_for('home'))
     
     units_fulfilled = int(request.form.get('units_fulfilled', 0))
     
-    request_data['fulfilled_units'] = request_data.get('fulfilled_units', 0) + units_fulfilled
+    fulfilled = request_data.get('fulfilled_units', 0) + units_fulfilled
+    units_needed = request_data['units_needed']
+    request_data['fulfilled_units'] = fulfilled
     
-    if request_data['fulfilled_units'] >= request_data['units_needed']:
+    if fulfilled >= units_needed:
         request_data['status'] = 'fulfilled'
-        flash('Request fully fulfilled!', 'success')
+        flash_message('Request fully fulfilled!', 'success')
     else:
         request_data['status'] = 'partial'
-        remaining = request_data['units_needed'] - request_data['fulfilled_units']
-        flash(f'Partially fulfilled! {remaining} units still needed.', 'info')
+        remaining = units_needed - fulfilled
+        flash_message(f'Partially fulfilled! {remaining} units still needed.', 'info')
+    _index_request(request_id)
     
     # Update inventory
     update_inventory(request_data['blood_group'], units_fulfilled, 'remove')
@@ -1305,7 +2220,7 @@ def fulfill_request(request_id):
 def logout():
     """Logout"""
     session.clear()
-    flash('Logged out successfully!', 'success')
+    flash_message('Logged out successfully!', 'success')
     return redirect(url_for('home'))
 
 # ============== ERROR HANDLERS ==============
@@ -1320,213 +2235,50 @@ def server_error(e):
 
 # ============== INITIALIZE SAMPLE DATA ==============
 
+# Pre-serialized sample records, copied in when the data directory is empty
+SEED_DIR = os.path.join(os.path.dirname(__file__), 'seed')
+SEED_FILES = {
+    DONORS_FILE: donors_db,
+    REQUESTORS_FILE: requestors_db,
+    BLOOD_REQUESTS_FILE: blood_requests_db
+}
+
 def init_sample_data():
-    """Initialize sample data for testing - only if not already loaded from files"""
+    """Initialize sample data for testing - only if not already loaded from files
+
+    The sample records ship pre-serialized in seed/; they are copied into the
+    data directory as-is and read back through the normal loader.
+    """
     # Only initialize if databases are empty (no data loaded from files)
     if donors_db or requestors_db or blood_requests_db:
         return  # Data already exists, don't reinitialize
-    sample_donors = [
-        {
-            'donor_id': 'DON-A1B2C3D4',
-            'name': 'Rahul Sharma',
-            'email': 'rahul@example.com',
-            'phone': '9876543210',
-            'age': 28,
-            'gender': 'Male',
-            'blood_group': 'O+',
-            'weight': 70,
-            'address': '123 Main Street',
-            'city': 'Mumbai',
-            'state': 'Maharashtra',
-            'pincode': '400001',
-            'medical_history': 'None',
-            'available': True,
-            'status': 'active',
-            'total_donations': 5,
-            'last_donation': '2024-12-01',
-            'registered_at': '2024-01-15 10:30:00',
-            'emergency_contact': '9876543211',
-            'preferred_contact_time': 'Evening'
-        },
-        {
-            'donor_id': 'DON-E5F6G7H8',
-            'name': 'Priya Patel',
-            'email': 'priya@example.com',
-            'phone': '8765432109',
-            'age': 32,
-            'gender': 'Female',
-            'blood_group': 'A+',
-            'weight': 58,
-            'address': '456 Park Avenue',
-            'city': 'Delhi',
-            'state': 'Delhi',
-            'pincode': '110001',
-            'medical_history': 'None',
-            'available': True,
-            'status': 'active',
-            'total_donations': 3,
-            'last_donation': '2025-01-10',
-            'registered_at': '2024-03-20 14:15:00',
-            'emergency_contact': '8765432110',
-            'preferred_contact_time': 'Morning'
-        },
-        {
-            'donor_id': 'DON-A2B3C4D5',
-            'name': 'Anjali Gupta',
-            'email': 'anjali@example.com',
-            'phone': '7654321098',
-            'age': 26,
-            'gender': 'Female',
-            'blood_group': 'A-',
-            'weight': 55,
-            'address': '789 Gandhi Road',
-            'city': 'Mumbai',
-            'state': 'Maharashtra',
-            'pincode': '400002',
-            'medical_history': 'None',
-            'available': True,
-            'status': 'active',
-            'total_donations': 2,
-            'last_donation': None,
-            'registered_at': '2024-06-10 09:00:00',
-            'emergency_contact': '7654321099',
-            'preferred_contact_time': 'Anytime'
-        },
-        {
-            'donor_id': 'DON-I9J0K1L2',
-            'name': 'Amit Kumar',
-            'email': 'amit@example.com',
-            'phone': '6543210987',
-            'age': 25,
-            'gender': 'Male',
-            'blood_group': 'B-',
-            'weight': 72,
-            'address': '321 Lake View',
-            'city': 'Bangalore',
-            'state': 'Karnataka',
-            'pincode': '560001',
-            'medical_history': 'None',
-            'available': True,
-            'status': 'active',
-            'total_donations': 2,
-            'last_donation': None,
-            'registered_at': '2024-06-10 09:00:00',
-            'emergency_contact': '6543210988',
-            'preferred_contact_time': 'Anytime'
-        },
-        {
-            'donor_id': 'DON-M3N4O5P6',
-            'name': 'Sneha Gupta',
-            'email': 'sneha@example.com',
-            'phone': '5432109876',
-            'age': 29,
-            'gender': 'Female',
-            'blood_group': 'O-',
-            'weight': 55,
-            'address': '654 Hillside',
-            'city': 'Chennai',
-            'state': 'Tamil Nadu',
-            'pincode': '600001',
-            'medical_history': 'None',
-            'available': True,
-            'status': 'active',
-            'total_donations': 8,
-            'last_donation': '2025-01-15',
-            'registered_at': '2023-08-05 16:45:00',
-            'emergency_contact': '5432109877',
-            'preferred_contact_time': 'Afternoon'
-        },
-        {
-            'donor_id': 'DON-Q7R8S9T0',
-            'name': 'Vikram Singh',
-            'email': 'vikram@example.com',
-            'phone': '4321098765',
-            'age': 35,
-            'gender': 'Male',
-            'blood_group': 'AB+',
-            'weight': 80,
-            'address': '987 River Road',
-            'city': 'Pune',
-            'state': 'Maharashtra',
-            'pincode': '411001',
-            'medical_history': 'None',
-            'available': True,
-            'status': 'active',
-            'total_donations': 4,
-            'last_donation': '2024-11-20',
-            'registered_at': '2024-02-28 11:20:00',
-            'emergency_contact': '4321098766',
-            'preferred_contact_time': 'Evening'
-        }
-    ]
-    
-    for donor in sample_donors:
-        donors_db[donor['donor_id']] = donor
-        blood_inventory[donor['blood_group']]['donors'].append(donor['donor_id'])
-    
-    # Sample requestors
-    sample_requestors = [
-        {
-            'requestor_id': 'REQ-X1Y2Z3A4',
-            'name': 'Dr. Meera Reddy',
-            'email': 'meera@hospital.com',
-            'phone': '3210987654',
-            'organization': 'City General Hospital',
-            'address': 'Hospital Road',
-            'city': 'Hyderabad',
-            'state': 'Telangana',
-            'pincode': '500001',
-            'registered_at': '2024-04-10 08:30:00',
-            'total_requests': 2
-        }
-    ]
-    
-    for requestor in sample_requestors:
-        requestors_db[requestor['requestor_id']] = requestor
-    
-    # Sample blood requests - A+ request that can be fulfilled by A+, A-, O+, O- donors
-    sample_requests = [
-        {
-            'request_id': 'BR-B5C6D7E8',
-            'requestor_id': 'REQ-X1Y2Z3A4',
-            'patient_name': 'Ramesh Iyer',
-            'patient_age': 45,
-            'patient_gender': 'Male',
-            'blood_group': 'A+',
-            'units_needed': 5,
-            'hospital_name': 'City General Hospital',
-            'hospital_address': 'Hospital Road, Hyderabad',
-            'location': 'Hyderabad',
-            'city': 'Hyderabad',
-            'state': 'Telangana',
-            'contact_name': 'Dr. Meera Reddy',
-            'contact_phone': '3210987654',
-            'contact_email': 'meera@hospital.com',
-            'urgency': 'high',
-            'required_date': '2025-02-05',
-            'reason': 'Surgery',
-            'status': 'pending',
-            'created_at': '2025-02-01 09:00:00',
-            'matched_donors': ['DON-E5F6G7H8', 'DON-A2B3C4D5', 'DON-A1B2C3D4', 'DON-M3N4O5P6'],
-            'fulfilled_units': 0,
-            'inventory_used': 0
-        }
-    ]
-    
-    for req in sample_requests:
-        blood_requests_db[req['request_id']] = req
+    try:
+        for file_path, store in SEED_FILES.items():
+            # Copy then rename, so a crash never leaves a half-copied data file
+            tmp_path = file_path + '.tmp'
+            shutil.copyfile(os.path.join(SEED_DIR, os.path.basename(file_path)), tmp_path)
+            os.replace(tmp_path, file_path)
+            store.update(load_json_file(file_path))
+    except OSError as e:
+        print(f"Error copying sample data: {e}")
+        return
+    fsync_dir(DATA_DIR)
+    
+    for donor in donors_db.values():
+        add_inventory_donor(donor['blood_group'], donor['donor_id'])
     
     # SAVE SAMPLE DATA PERSISTENTLY
-    save_json_file(DONORS_FILE, donors_db)
-    save_json_file(REQUESTORS_FILE, requestors_db)
-    save_json_file(BLOOD_REQUESTS_FILE, blood_requests_db)
     save_json_file(INVENTORY_FILE, blood_inventory)
     print("Sample data initialized and saved to JSON files")
 
 # Initialize sample data
 init_sample_data()
+rebuild_indexes()
 
 # ============== MAIN ==============
 
 if __name__ == '__main__':
+    # HTTP/1.1 lets polling dashboards reuse one keep-alive connection
+    # instead of reconnecting for every request.
+    WSGIRequestHandler.protocol_version = 'HTTP/1.1'
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -9,20 +9,95 @@ Notes:
   back to in-memory dictionaries to avoid crashing during local development.
 """
 from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
-from datetime import datetime
+from jinja2 import FileSystemBytecodeCache
+from datetime import datetime, date
+from functools import lru_cache
+from collections import Counter
+from collections.abc import Mapping
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+import gzip
+import heapq
 import uuid
 import os
 import json
+import time
+import secrets
+import threading
+import atexit
 import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+from boto3.dynamodb.conditions import Key, Attr
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+try:
+    import numpy as np
+except ImportError:  # optional - donor matching falls back to per-donor Python loops
+    np = None
+
+try:
+    import orjson
+except ImportError:  # optional - the data files fall back to the stdlib json module
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional - responses fall back to the stdlib gzip hook below
+    Compress = None
+
+# Data files hold one compact record per line; PRETTY_JSON=1 writes them
+# indented instead, for reading by hand while debugging
+PRETTY_JSON = os.environ.get('PRETTY_JSON') == '1'
+
+if orjson is not None:
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        if PRETTY_JSON:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    _loads = json.loads
 
 app = Flask(__name__)
 app.secret_key = 'bloodsync-aws-key'
+# Keep compiled templates on disk so new worker processes skip re-parsing them
+# (JINJA_CACHE_DIR, or a per-user directory under the system temp dir)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.environ.get('JINJA_CACHE_DIR'))
+
+# Compress pages and JSON for clients that accept it; the dashboards inline
+# every row and are by far the largest responses
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_MIMETYPES = frozenset(('text/html', 'application/json'))
+
+if Compress is not None:
+    Compress(app)
+else:
+    @app.after_request
+    def gzip_response(response):
+        if response.mimetype not in COMPRESS_MIMETYPES or response.direct_passthrough:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or 'Content-Encoding' in response.headers
+                or not request.accept_encodings['gzip']):
+            return response
+        data = response.get_data()
+        if len(data) >= COMPRESS_MIN_BYTES:
+            response.set_data(gzip.compress(data, compresslevel=6))
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
 
 # AWS Configuration
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
-dynamodb = boto3.resource('dynamodb', region_name=REGION)
+# Pooled, keep-alive connections, so each thread's calls reuse TCP+TLS
+# sessions instead of reconnecting
+BOTO_CONFIG = Config(
+    max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', 50)),
+    retries={'max_attempts': 3, 'mode': 'standard'},
+    tcp_keepalive=True
+)
 
 # Table names used by this app
 TABLE_NAMES = {
@@ -34,14 +109,40 @@ TABLE_NAMES = {
     'inventory': 'Inventory'
 }
 
+# boto3 sessions and resources are not thread-safe, so every thread (request
+# threads and the query pool alike) builds its own on first use and keeps it
+_thread_aws = threading.local()
+
 # Try to obtain table objects; if not available, fall back to in-memory stores
-def _get_table(name):
+def _get_table(resource, name):
     try:
-        return dynamodb.Table(name)
+        return resource.Table(name)
     except Exception:
         return None
 
-tables = {k: _get_table(v) for k, v in TABLE_NAMES.items()}
+def _dynamodb():
+    """The calling thread's DynamoDB resource"""
+    resource = getattr(_thread_aws, 'dynamodb', None)
+    if resource is None:
+        resource = boto3.session.Session().resource('dynamodb', region_name=REGION, config=BOTO_CONFIG)
+        _thread_aws.dynamodb = resource
+        _thread_aws.tables = {k: _get_table(resource, v) for k, v in TABLE_NAMES.items()}
+    return resource
+
+class _ThreadTables(Mapping):
+    """TABLE_NAMES key -> Table of the calling thread's own resource"""
+
+    def __getitem__(self, table_key):
+        _dynamodb()
+        return _thread_aws.tables[table_key]
+
+    def __iter__(self):
+        return iter(TABLE_NAMES)
+
+    def __len__(self):
+        return len(TABLE_NAMES)
+
+tables = _ThreadTables()
 
 # In-memory fallbacks
 donors_db = {}
@@ -56,38 +157,89 @@ registrations_db = {}
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
+# Parsed data files keyed by name -> ((mtime_ns, size), data). A file is only
+# re-read and re-parsed when its stat changes, so repeated scans are cheap.
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+
+def _file_stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
 def _load_json_file(name):
     path = os.path.join(DATA_DIR, name)
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
+        stamp = _file_stamp(path)
+    except OSError:
         return None
+    cached = _json_cache.get(name)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with _json_cache_lock:
+        cached = _json_cache.get(name)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                data = _loads(f.read())
+        except Exception:
+            return None
+        _json_cache[name] = (stamp, data)
+        return data
+
+def _write_records(f, data):
+    # encode a list record by record instead of building the whole document
+    if PRETTY_JSON or not isinstance(data, list) or not data:
+        f.write(_dumps(data))
+        return
+    sep = b'[\n'
+    for record in data:
+        f.write(sep)
+        f.write(_dumps(record))
+        sep = b',\n'
+    f.write(b'\n]\n')
 
 def _save_json_file(name, data):
     path = os.path.join(DATA_DIR, name)
+    tmp_path = path + '.tmp'
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with _json_cache_lock:
+            # write a temp file and swap it in, so a failed write never truncates the store
+            with open(tmp_path, 'wb') as f:
+                _write_records(f, data)
+            os.replace(tmp_path, path)
+            # what was just written is what a reload would parse
+            _json_cache[name] = (_file_stamp(path), data)
         return True
     except Exception:
+        _json_cache.pop(name, None)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return False
 
+# table key -> the parsed file list its in-memory store was last rebuilt from
+_scanned_from = {}
+
 # attempt to seed in-memory stores from data files if present
 _seed = _load_json_file('donors.json')
 if isinstance(_seed, list):
     for d in _seed:
         donors_db[d.get('donor_id')] = d
+    _scanned_from['donors'] = _seed
 _seed = _load_json_file('inventory.json')
 if isinstance(_seed, list):
     for i in _seed:
         # inventory items keyed by blood_group if no id
         key = i.get('blood_group') or i.get('group') or i.get('inventory_id') or str(len(inventory_db)+1)
         inventory_db[key] = i
+    _scanned_from['inventory'] = _seed
 _seed = _load_json_file('donor_registrations.json')
 if isinstance(_seed, list):
     for r in _seed:
         registrations_db[r.get('registration_id')] = r
+    _scanned_from['donor_registrations'] = _seed
 
 # Compatibility data (same as in the main app)
 BLOOD_COMPATIBILITY = {
@@ -112,7 +264,109 @@ RECEIVE_COMPATIBILITY = {
     'O-': ['O-']
 }
 
+BLOOD_GROUPS = tuple(sorted(set(BLOOD_COMPATIBILITY) | set(RECEIVE_COMPATIBILITY)))
+
+# Set views for per-item membership tests; the lists above keep their order
+# for anything that iterates them (the per-group GSI queries)
+DONATE_TO_SETS = {bg: frozenset(groups) for bg, groups in BLOOD_COMPATIBILITY.items()}
+RECEIVE_FROM_SETS = {bg: frozenset(groups) for bg, groups in RECEIVE_COMPATIBILITY.items()}
+
+# Groups with fewer units than this are listed as critical
+CRITICAL_UNITS = 20
+
+# Request statuses that still need blood
+ACTIVE_STATUSES = frozenset(('pending', 'partial'))
+
+# Inventory map with every standard blood group present, copied per page and
+# overlaid with the real items (the entries themselves are never mutated)
+_EMPTY_INV_TEMPLATE = {bg: {'units': 0, 'donors': []} for bg in BLOOD_GROUPS}
+
 # --- DynamoDB helper functions with fallback ---
+# Per-call item limits of BatchGetItem / BatchWriteItem
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+BATCH_RETRIES = 5
+
+def _convert_floats_to_decimal(obj):
+    # DynamoDB does not accept Python floats; convert floats to Decimal
+    if isinstance(obj, dict):
+        return {k: _convert_floats_to_decimal(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_convert_floats_to_decimal(v) for v in obj]
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    return obj
+
+# table key -> date attribute that is the sort key of its RECENT_INDEX GSI
+RECENT_INDEXED = {'donations': 'donation_date'}
+
+def _dynamo_item(table_key, item):
+    # items of date-indexed tables carry the GSI partition key, entity_type,
+    # on DynamoDB only; the local files are left as they are
+    if table_key in RECENT_INDEXED:
+        item = {**item, 'entity_type': table_key}
+    return _convert_floats_to_decimal(item)
+
+def _batch_retry(operation, call, request_items, unprocessed_key):
+    # Resend whatever DynamoDB reports as unprocessed, backing off between tries
+    for attempt in range(BATCH_RETRIES):
+        resp = call(RequestItems=request_items)
+        yield resp
+        request_items = resp.get(unprocessed_key) or {}
+        if not request_items:
+            return
+        time.sleep(0.05 * 2 ** attempt)
+    raise ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException',
+                                 'Message': 'unprocessed batch items after retries'}}, operation)
+
+def db_batch_get(lookups):
+    """Fetch [(table_key, key), ...] in as few BatchGetItem calls as possible
+
+    Returns the items in lookup order (None where missing). Falls back to
+    db_get per key when a table is unavailable or the batch call fails.
+    """
+    if lookups and all(tables.get(table_key) for table_key, _ in lookups):
+        try:
+            found = {}
+            unique = list({(table_key, tuple(sorted(key.items()))) for table_key, key in lookups})
+            for start in range(0, len(unique), BATCH_GET_LIMIT):
+                request_items = {}
+                for table_key, key in unique[start:start + BATCH_GET_LIMIT]:
+                    request_items.setdefault(TABLE_NAMES[table_key], {'Keys': []})['Keys'].append(dict(key))
+                for resp in _batch_retry('BatchGetItem', _dynamodb().batch_get_item, request_items, 'UnprocessedKeys'):
+                    for table_name, items in resp.get('Responses', {}).items():
+                        for item in items:
+                            found.setdefault(table_name, []).append(item)
+            return [next((item for item in found.get(TABLE_NAMES[table_key], [])
+                          if all(item.get(k) == v for k, v in key.items())), None)
+                    for table_key, key in lookups]
+        except (ClientError, NoCredentialsError):
+            pass
+    return [db_get(table_key, key) for table_key, key in lookups]
+
+def db_put_many(entries):
+    """Write [(table_key, item), ...] with BatchWriteItem, 25 items per call
+
+    Falls back to db_put per item when a table is unavailable or the batch
+    call fails.
+    """
+    if entries and all(tables.get(table_key) for table_key, _ in entries):
+        try:
+            for start in range(0, len(entries), BATCH_WRITE_LIMIT):
+                request_items = {}
+                for table_key, item in entries[start:start + BATCH_WRITE_LIMIT]:
+                    _forget_lookup(table_key, item)
+                    request_items.setdefault(TABLE_NAMES[table_key], []).append(
+                        {'PutRequest': {'Item': _dynamo_item(table_key, item)}})
+                for _ in _batch_retry('BatchWriteItem', _dynamodb().batch_write_item, request_items, 'UnprocessedItems'):
+                    pass
+            for table_key in {table_key for table_key, _ in entries}:
+                _bump_store_version(table_key)
+            return True
+        except (ClientError, NoCredentialsError):
+            pass
+    return all([db_put(table_key, item) for table_key, item in entries])
+
 def db_get(table_key, key):
     t = tables.get(table_key)
     if t:
@@ -133,149 +387,345 @@ def db_get(table_key, key):
         return registrations_db.get(key.get('registration_id'))
     return None
 
+# Signed-in donor/requestor lookups, reused across dashboard refreshes. An
+# entry expires after SESSION_LOOKUP_TTL, when its store is rebuilt, or as
+# soon as the item is written through db_put/db_put_many.
+SESSION_LOOKUP_TTL = 30   # seconds
+SESSION_LOOKUP_CACHE_SIZE = 1024
+_session_lookups = {}   # (table key, id) -> (store version, expiry, item)
+
+def db_get_cached(table_key, item_id):
+    """db_get by id for the session's own donor/requestor, through the lookup cache"""
+    cache_key = (table_key, item_id)
+    version = _store_versions.get(table_key, 0)
+    now = time.monotonic()
+    cached = _session_lookups.get(cache_key)
+    if cached and cached[0] == version and now < cached[1]:
+        return cached[2]
+    item = db_get(table_key, {SCAN_FILES[table_key][1]: item_id})
+    if item is not None:
+        if len(_session_lookups) >= SESSION_LOOKUP_CACHE_SIZE:
+            _session_lookups.clear()
+        _session_lookups[cache_key] = (version, now + SESSION_LOOKUP_TTL, item)
+    return item
+
+def _forget_lookup(table_key, item):
+    id_field = SCAN_FILES[table_key][1] if table_key in SCAN_FILES else None
+    if id_field:
+        _session_lookups.pop((table_key, item.get(id_field)), None)
+
+# Writes to the fallback stores only mark the table dirty; a timer then saves
+# each dirty table's file once, so a burst of puts costs one file rewrite.
+# _flush_lock covers the stores themselves too: a fallback write and a
+# rebuild of its store from the file never interleave.
+FLUSH_DELAY = 0.5   # seconds
+_dirty_tables = set()
+_store_versions = {}   # table key -> counter bumped whenever its store changes
+_flush_lock = threading.RLock()
+_save_lock = threading.Lock()   # one flush writing files at a time
+_flush_timer = None
+
+def _bump_store_version(table_key):
+    _store_versions[table_key] = _store_versions.get(table_key, 0) + 1
+
+def _mark_dirty(table_key):
+    global _flush_timer
+    with _flush_lock:
+        _dirty_tables.add(table_key)
+        _bump_store_version(table_key)
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(FLUSH_DELAY, flush_dirty_tables)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+def flush_dirty_tables():
+    """Save every dirty fallback store to its data file now"""
+    global _flush_timer
+    with _save_lock:
+        with _flush_lock:
+            pending = [(table_key, _store_versions.get(table_key, 0), list(_scan_store(table_key).values()))
+                       for table_key in _dirty_tables]
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+        for table_key, version, data in pending:
+            # memory stays authoritative (the table stays dirty) until its save succeeds
+            if _save_json_file(SCAN_FILES[table_key][0], data):
+                with _flush_lock:
+                    # the saved list is what the store holds, so it is not rebuilt from it
+                    _scanned_from[table_key] = data
+                    if _store_versions.get(table_key, 0) == version:
+                        _dirty_tables.discard(table_key)
+                    # else written to since the snapshot; its own timer saves it again
+
+atexit.register(flush_dirty_tables)
+
 def db_put(table_key, item):
+    global _inventory_by_bg
+    _forget_lookup(table_key, item)
     t = tables.get(table_key)
     if t:
         try:
-            # DynamoDB does not accept Python floats; convert floats to Decimal
-            def _convert_floats_to_decimal(obj):
-                if isinstance(obj, dict):
-                    return {k: _convert_floats_to_decimal(v) for k, v in obj.items()}
-                if isinstance(obj, list):
-                    return [_convert_floats_to_decimal(v) for v in obj]
-                if isinstance(obj, float):
-                    return Decimal(str(obj))
-                return obj
-
-            safe_item = _convert_floats_to_decimal(item)
-            t.put_item(Item=safe_item)
+            t.put_item(Item=_dynamo_item(table_key, item))
+            _bump_store_version(table_key)  # still a change for caches and ETags
             return True
         except (ClientError, NoCredentialsError):
             # Fall back to in-memory on AWS errors or missing credentials
             pass
-    # fallback
-    if table_key == 'donors':
-        donors_db[item['donor_id']] = item
-        # persist donors list to data/donors.json for local visibility
-        try:
-            _save_json_file('donors.json', list(donors_db.values()))
-        except Exception:
-            pass
-        return True
-    if table_key == 'requestors':
-        requestors_db[item['requestor_id']] = item
-        try:
-            _save_json_file('requestors.json', list(requestors_db.values()))
-        except Exception:
-            pass
-        return True
-    if table_key == 'requests':
-        blood_requests_db[item['request_id']] = item
-        try:
-            _save_json_file('blood_requests.json', list(blood_requests_db.values()))
-        except Exception:
-            pass
-        return True
-    if table_key == 'donations':
-        donations_db[item['donation_id']] = item
-        try:
-            _save_json_file('donations.json', list(donations_db.values()))
-        except Exception:
-            pass
-        return True
-    if table_key == 'assignments':
-        assignments_db[item['assignment_id']] = item
-        try:
-            _save_json_file('assignments.json', list(assignments_db.values()))
-        except Exception:
-            pass
-        return True
-    if table_key == 'donor_registrations':
-        registrations_db[item['registration_id']] = item
-        try:
-            _save_json_file('donor_registrations.json', list(registrations_db.values()))
-        except Exception:
-            pass
-        return True
-    if table_key == 'inventory':
-        # key by blood_group where possible
-        key = item.get('blood_group') or item.get('inventory_id') or str(len(inventory_db) + 1)
-        inventory_db[key] = item
-        try:
-            _save_json_file('inventory.json', list(inventory_db.values()))
-        except Exception:
-            pass
-        return True
-    return False
+    # fallback, under the lock so a concurrent rebuild cannot drop the write
+    with _flush_lock:
+        if table_key == 'donors':
+            donors_db[item['donor_id']] = item
+            # persisted to data/donors.json for local visibility
+            _mark_dirty(table_key)
+            return True
+        if table_key == 'requestors':
+            requestors_db[item['requestor_id']] = item
+            _mark_dirty(table_key)
+            return True
+        if table_key == 'requests':
+            blood_requests_db[item['request_id']] = item
+            _mark_dirty(table_key)
+            return True
+        if table_key == 'donations':
+            donations_db[item['donation_id']] = item
+            _mark_dirty(table_key)
+            return True
+        if table_key == 'assignments':
+            assignments_db[item['assignment_id']] = item
+            _mark_dirty(table_key)
+            return True
+        if table_key == 'donor_registrations':
+            registrations_db[item['registration_id']] = item
+            _mark_dirty(table_key)
+            return True
+        if table_key == 'inventory':
+            # key by blood_group where possible
+            key = item.get('blood_group') or item.get('inventory_id') or str(len(inventory_db) + 1)
+            inventory_db[key] = item
+            _inventory_by_bg = None
+            _mark_dirty(table_key)
+            return True
+        return False
+
+# Data file and id field behind each scannable store
+SCAN_FILES = {
+    'donors': ('donors.json', 'donor_id'),
+    'requestors': ('requestors.json', 'requestor_id'),
+    'requests': ('blood_requests.json', 'request_id'),
+    'donations': ('donations.json', 'donation_id'),
+    'assignments': ('assignments.json', 'assignment_id'),
+    'donor_registrations': ('donor_registrations.json', 'registration_id'),
+    'inventory': ('inventory.json', None)
+}
+
+def _inventory_key(item, inventory):
+    return item.get('blood_group') or item.get('group') or item.get('inventory_id') or str(len(inventory)+1)
+
+# blood group -> inventory item (first in scan order); None until rebuilt
+_inventory_by_bg = None
 
 def db_scan(table_key):
+    if table_key not in SCAN_FILES:
+        return []
+    return list(_refresh_store(table_key).values())
+
+def _refresh_store(table_key):
     # First, reload from JSON files to ensure fresh data across all pages
     global donors_db, requestors_db, blood_requests_db, donations_db, assignments_db, inventory_db, registrations_db
+    global _inventory_by_bg
     
-    if table_key == 'donors':
-        seed = _load_json_file('donors.json')
-        if isinstance(seed, list):
-            donors_db = {}
-            for d in seed:
-                donors_db[d.get('donor_id')] = d
-        return list(donors_db.values())
-    elif table_key == 'requestors':
-        seed = _load_json_file('requestors.json')
-        if isinstance(seed, list):
-            requestors_db = {}
-            for r in seed:
-                requestors_db[r.get('requestor_id')] = r
-        return list(requestors_db.values())
-    elif table_key == 'requests':
-        seed = _load_json_file('blood_requests.json')
-        if isinstance(seed, list):
-            blood_requests_db = {}
-            for r in seed:
-                blood_requests_db[r.get('request_id')] = r
-        return list(blood_requests_db.values())
-    elif table_key == 'donations':
-        seed = _load_json_file('donations.json')
-        if isinstance(seed, list):
-            donations_db = {}
-            for d in seed:
-                donations_db[d.get('donation_id')] = d
-        return list(donations_db.values())
-    elif table_key == 'assignments':
-        seed = _load_json_file('assignments.json')
-        if isinstance(seed, list):
-            assignments_db = {}
-            for a in seed:
-                assignments_db[a.get('assignment_id')] = a
-        return list(assignments_db.values())
-    elif table_key == 'donor_registrations':
-        seed = _load_json_file('donor_registrations.json')
-        if isinstance(seed, list):
-            registrations_db = {}
-            for r in seed:
-                registrations_db[r.get('registration_id')] = r
-        return list(registrations_db.values())
-    elif table_key == 'inventory':
-        seed = _load_json_file('inventory.json')
-        if isinstance(seed, list):
-            inventory_db = {}
-            for i in seed:
-                key = i.get('blood_group') or i.get('group') or i.get('inventory_id') or str(len(inventory_db)+1)
-                inventory_db[key] = i
-        return list(inventory_db.values())
-    return []
+    if table_key in _dirty_tables:
+        return _scan_store(table_key)  # memory holds writes the file does not have yet
+    file_name, id_field = SCAN_FILES[table_key]
+    seed = _load_json_file(file_name)
+    # An unchanged file parses to the same cached list; only rebuild on a new one
+    if not isinstance(seed, list) or seed is _scanned_from.get(table_key):
+        return _scan_store(table_key)
+    with _flush_lock:
+        # re-check now that no write or flush is in progress: the table may have
+        # been written to, or a flush may have saved a newer list than seed
+        cached = _json_cache.get(file_name)
+        if (table_key in _dirty_tables or seed is _scanned_from.get(table_key)
+                or cached is None or cached[1] is not seed):
+            return _scan_store(table_key)
+        store = {}
+        for item in seed:
+            store[_inventory_key(item, store) if id_field is None else item.get(id_field)] = item
+        _scanned_from[table_key] = seed
+        _bump_store_version(table_key)
+        if table_key == 'donors':
+            donors_db = store
+        elif table_key == 'requestors':
+            requestors_db = store
+        elif table_key == 'requests':
+            blood_requests_db = store
+        elif table_key == 'donations':
+            donations_db = store
+        elif table_key == 'assignments':
+            assignments_db = store
+        elif table_key == 'donor_registrations':
+            registrations_db = store
+        else:
+            inventory_db = store
+            _inventory_by_bg = None
+    return _scan_store(table_key)
+
+# Derived read results, cached under the store versions they were computed
+# from, so any write or file change invalidates them
+VERSIONED_CACHE_SIZE = 64
+_versioned_cache = {}
+
+def versioned(name, table_keys, compute, *args):
+    """Return compute(), cached until any of the named stores changes
+
+    Extra args become part of the cache key.
+    """
+    for table_key in table_keys:
+        _refresh_store(table_key)  # pick up changes made to the files on disk
+    key = (name, args, tuple(_store_versions.get(table_key, 0) for table_key in table_keys))
+    try:
+        return _versioned_cache[key]
+    except KeyError:
+        pass
+    value = compute()
+    if len(_versioned_cache) >= VERSIONED_CACHE_SIZE:
+        _versioned_cache.clear()
+    _versioned_cache[key] = value
+    return value
+
+# Per-process tag prefix, so ETags from before a restart never match
+_ETAG_BOOT_ID = secrets.token_hex(4)
+PAGE_CACHE_CONTROL = 'private, no-cache'
+
+def versions_etag(table_keys):
+    """Opaque tag that changes whenever any of the named stores changes"""
+    for table_key in table_keys:
+        _refresh_store(table_key)
+    return '-'.join([_ETAG_BOOT_ID] + [str(_store_versions.get(table_key, 0)) for table_key in table_keys])
+
+def conditional_response(table_keys, build):
+    """Answer 304 when the client's ETag still matches, else build() the response
+
+    For pages drawn only from the named stores. The store versions only see
+    this process's writes, so they tag the page only when none of the stores
+    has a DynamoDB table; otherwise the page is built and tagged by a hash of
+    its body. A page rendered while flash messages are pending shows (and
+    consumes) them, so it is always built and gets no ETag.
+    """
+    if '_flashes' in session:
+        return build()
+    if any(tables.get(table_key) for table_key in table_keys):
+        response = app.make_response(build())
+        response.add_etag(weak=True)
+        response.headers['Cache-Control'] = PAGE_CACHE_CONTROL
+        return response.make_conditional(request)
+    etag = versions_etag(table_keys)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.make_response(build())
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = PAGE_CACHE_CONTROL
+    return response
+
+def db_scan_get(table_key, item_id):
+    """One item of a scanned store by its id field, without copying the store"""
+    return _refresh_store(table_key).get(item_id)
+
+def db_count(table_key):
+    """Number of items db_scan(table_key) would return"""
+    return len(_refresh_store(table_key))
+
+def _sum_inventory_units():
+    return sum(int(i.get('units', 0)) for i in _refresh_store('inventory').values())
+
+def inventory_units_total():
+    """Total units across the inventory, summed once per inventory version"""
+    return versioned('inventory_units_total', ('inventory',), _sum_inventory_units)
+
+def _build_inventory_snapshot():
+    # map expected by templates (every standard blood group present)
+    inventory_map = {**_EMPTY_INV_TEMPLATE}
+    for item in _refresh_store('inventory').values():
+        bg = item.get('blood_group') or item.get('group') or 'Unknown'
+        inventory_map[bg] = {
+            'units': int(item.get('units', 0)),
+            'donors': item.get('donors') or []
+        }
+    critical_groups = [bg for bg, v in inventory_map.items() if v['units'] < CRITICAL_UNITS]
+    return inventory_map, critical_groups
+
+def inventory_snapshot():
+    """(inventory map by blood group, critical groups), built once per inventory version"""
+    return versioned('inventory_snapshot', ('inventory',), _build_inventory_snapshot)
+
+def _count_request_statuses():
+    return Counter(r.get('status') for r in _refresh_store('requests').values())
+
+def request_status_counts():
+    """Counter of request statuses, tallied once per requests version"""
+    return versioned('request_status_counts', ('requests',), _count_request_statuses)
+
+def _group_donations_by_donor():
+    by_donor = {}
+    for donation in _refresh_store('donations').values():
+        by_donor.setdefault(donation.get('donor_id'), []).append(donation)
+    return by_donor
+
+def donations_by_donor():
+    """donor_id -> that donor's donations in store order, built once per donations version"""
+    return versioned('donations_by_donor', ('donations',), _group_donations_by_donor)
+
+def db_get_inventory_by_bg(blood_group):
+    """Inventory item for a blood group, or None"""
+    global _inventory_by_bg
+    items = _refresh_store('inventory')
+    if _inventory_by_bg is None:
+        index = {}
+        for item in items.values():
+            bg = item.get('blood_group') or item.get('group')
+            if bg:
+                index.setdefault(bg, item)
+        _inventory_by_bg = index
+    return _inventory_by_bg.get(blood_group)
+
+def _scan_store(table_key):
+    return {
+        'donors': donors_db,
+        'requestors': requestors_db,
+        'requests': blood_requests_db,
+        'donations': donations_db,
+        'assignments': assignments_db,
+        'donor_registrations': registrations_db,
+        'inventory': inventory_db
+    }[table_key]
 
 # --- Utility functions (adapted from original app) ---
 def generate_id(prefix='ID'):
     return f"{prefix}-{uuid.uuid4().hex[:8].upper()}"
 
+@lru_cache(maxsize=4096)
+def _cached_ymd(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except Exception:
+        return None
+
+def parse_ymd(value):
+    """Parse a 'YYYY-MM-DD' string into a date (None if missing/invalid), memoized"""
+    try:
+        return _cached_ymd(value)
+    except TypeError:  # unhashable value
+        return None
+
 def can_donate(last_donation_date):
     if not last_donation_date:
         return True
-    try:
-        last = datetime.strptime(last_donation_date, '%Y-%m-%d')
-        return (datetime.now() - last).days >= 56
-    except Exception:
+    last = parse_ymd(last_donation_date)
+    if last is None:
         return True
+    return (date.today() - last).days >= 56
 
 def calculate_donor_eligibility(donor):
     score = 100
@@ -288,86 +738,279 @@ def calculate_donor_eligibility(donor):
         score -= 100
     last_donation = donor.get('last_donation')
     if last_donation:
-        try:
-            days_since = (datetime.now() - datetime.strptime(last_donation, '%Y-%m-%d')).days
-            if days_since > 90:
-                score += 5
-        except Exception:
-            pass
+        last = parse_ymd(last_donation)
+        if last is not None and (date.today() - last).days > 90:
+            score += 5
     else:
         score += 10
     total_donations = donor.get('total_donations', 0)
     score += min(total_donations * 2, 20)
     return max(0, min(score, 150))
 
-def get_compatible_donors(recipient_blood_group, location=None):
+# --- Vectorized donor matching (optional NumPy) ---
+# Column copy of the donor fields used for filtering and scoring, one row per
+# donor in store order, rebuilt whenever the donors store changes. Only used
+# once there are enough donors for NumPy to beat the per-donor loops.
+VECTORIZE_MIN_DONORS = 256
+
+_donor_columns = None   # (donors store version, DonorColumns or None)
+
+class DonorColumns:
+    __slots__ = ('donors', 'bg', 'eligible', 'available', 'age', 'total_donations',
+                 'has_last', 'last_ord', 'last_rank', 'places')
+
+    def __init__(self, donors):
+        self.donors = donors
+        n = len(donors)
+        self.bg = np.array([d.get('blood_group') or '' for d in donors], dtype=object)
+        self.eligible = np.fromiter((bool(d.get('available')) and d.get('status') == 'active' for d in donors),
+                                    dtype=bool, count=n)
+        self.available = np.fromiter((bool(d.get('available', True)) for d in donors), dtype=bool, count=n)
+        self.age = np.array([d.get('age', 0) for d in donors], dtype=np.float64)
+        self.total_donations = np.array([d.get('total_donations', 0) for d in donors], dtype=np.float64)
+        last = [d.get('last_donation') for d in donors]
+        self.has_last = np.fromiter((bool(v) for v in last), dtype=bool, count=n)
+        # date ordinal of a valid last donation, 0 when missing or unparseable
+        self.last_ord = np.fromiter((_date_ordinal(v) for v in last), dtype=np.int64, count=n)
+        # rank of the raw sort key used by get_compatible_donors
+        keys = [v or '1900-01-01' for v in last]
+        ranks = {key: i for i, key in enumerate(sorted(set(keys)))}
+        self.last_rank = np.fromiter((ranks[key] for key in keys), dtype=np.int64, count=n)
+        # lowercased city/state -> rows, for substring location matches
+        self.places = {}
+        for row, d in enumerate(donors):
+            for place in {d.get('city', '').lower(), d.get('state', '').lower()}:
+                self.places.setdefault(place, []).append(row)
+
+    def compatible_rows(self, recipient_blood_group, location):
+        """Rows get_compatible_donors would return, in the same order"""
+        compatible_bgs = RECEIVE_COMPATIBILITY.get(recipient_blood_group, [])
+        mask = self.eligible & np.isin(self.bg, list(compatible_bgs))
+        if location:
+            loc = location.lower()
+            near = np.zeros(len(self.donors), dtype=bool)
+            for place, rows in self.places.items():
+                if loc in place:
+                    near[rows] = True
+            mask &= near
+        rows = np.flatnonzero(mask)
+        return rows[np.argsort(-self.last_rank[rows], kind='stable')]
+
+    def score_rows(self, rows):
+        """(match scores, can donate now) for rows, same rules as the Python helpers"""
+        age = self.age[rows]
+        last_ord = self.last_ord[rows]
+        has_last = self.has_last[rows]
+        days_since = date.today().toordinal() - last_ord
+        scores = np.full(len(rows), 100.0)
+        scores += np.where((age >= 25) & (age <= 45), 10, np.where((age < 18) | (age > 65), -50, 0))
+        scores -= np.where(self.available[rows], 0, 100)
+        scores += np.where(has_last, np.where((last_ord > 0) & (days_since > 90), 5, 0), 10)
+        scores += np.minimum(self.total_donations[rows] * 2, 20)
+        np.clip(scores, 0, 150, out=scores)
+        can_donate_now = ~has_last | (last_ord == 0) | (days_since >= 56)
+        return scores, can_donate_now
+
+_donor_places = None   # (donors store version, [(donor, city, state, last donation key), ...])
+
+def donor_places():
+    """Donors in store order with their lowercased city and state
+
+    Lowercased once per donors store version rather than per donor per search,
+    together with the key get_compatible_donors sorts by (last donation date,
+    with undated donors last).
+    """
+    global _donor_places
+    store = _refresh_store('donors')
+    version = _store_versions.get('donors', 0)
+    if _donor_places is None or _donor_places[0] != version:
+        _donor_places = (version, [(d, str(d.get('city', '')).lower(), str(d.get('state', '')).lower(),
+                                    d.get('last_donation') or '1900-01-01')
+                                   for d in store.values()])
+    return _donor_places[1]
+
+def _date_ordinal(value):
+    parsed = parse_ymd(value)
+    return parsed.toordinal() if parsed else 0
+
+def _get_donor_columns():
+    """DonorColumns for the current donors store, or None to use the Python path"""
+    global _donor_columns
+    if np is None:
+        return None
+    store = _refresh_store('donors')
+    if len(store) < VECTORIZE_MIN_DONORS:
+        return None
+    version = _store_versions.get('donors', 0)
+    if _donor_columns is None or _donor_columns[0] != version:
+        try:
+            columns = DonorColumns(list(store.values()))
+        except (TypeError, ValueError, AttributeError):
+            columns = None  # a field with an unexpected type; score those donors in Python
+        _donor_columns = (version, columns)
+    return _donor_columns[1]
+
+# --- DynamoDB blood-group index queries ---
+# Global secondary index on Donors.blood_group. Compatible donors are fetched
+# with one Query per compatible group instead of scanning the whole table.
+DONORS_BG_INDEX = os.environ.get('DONORS_BG_INDEX', 'blood_group-index')
+GSI_RETRY_SECONDS = 60   # how long to use the local stores after the index was unreachable
+
+_gsi_unavailable_until = 0.0
+_query_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ddb-query')
+
+def _query_donors_by_bg(blood_group):
+    donors_table = tables['donors']
+    kwargs = {
+        'IndexName': DONORS_BG_INDEX,
+        'KeyConditionExpression': Key('blood_group').eq(blood_group),
+        'FilterExpression': Attr('available').eq(True) & Attr('status').eq('active')
+    }
+    items = []
+    while True:
+        resp = donors_table.query(**kwargs)
+        items.extend(resp.get('Items', []))
+        if 'LastEvaluatedKey' not in resp:
+            return items
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+def query_compatible_donors(recipient_blood_group):
+    """Available, active donors of every compatible group via the GSI
+
+    Returns None when the table or index cannot be queried, so callers fall
+    back to the local stores; failures are remembered for GSI_RETRY_SECONDS.
+    """
+    global _gsi_unavailable_until
+    if not tables.get('donors') or time.monotonic() < _gsi_unavailable_until:
+        return None
     compatible_bgs = RECEIVE_COMPATIBILITY.get(recipient_blood_group, [])
-    donors = db_scan('donors')
-    results = []
-    for d in donors:
-        if d.get('blood_group') in compatible_bgs and d.get('available') and d.get('status') == 'active':
-            if location:
-                if location.lower() in d.get('city', '').lower() or location.lower() in d.get('state', '').lower():
-                    results.append(d)
-            else:
-                results.append(d)
+    try:
+        results = []
+        for items in _query_pool.map(_query_donors_by_bg, compatible_bgs):
+            results.extend(items)
+        return results
+    except (ClientError, BotoCoreError):
+        # includes missing credentials and an unreachable endpoint
+        _gsi_unavailable_until = time.monotonic() + GSI_RETRY_SECONDS
+        return None
+
+# Newest-first GSI (partition key entity_type, sort key from RECENT_INDEXED),
+# so a recent-N list reads N items instead of scanning the table
+RECENT_INDEX = os.environ.get('RECENT_INDEX', 'by_date')
+_recent_unavailable_until = 0.0
+
+def db_query_recent(table_key, limit):
+    """Newest `limit` items of a date-indexed table, or None to fall back to a scan"""
+    global _recent_unavailable_until
+    t = tables.get(table_key)
+    if not t or table_key not in RECENT_INDEXED or time.monotonic() < _recent_unavailable_until:
+        return None
+    try:
+        resp = t.query(IndexName=RECENT_INDEX,
+                       KeyConditionExpression=Key('entity_type').eq(table_key),
+                       ScanIndexForward=False, Limit=limit)
+        return resp.get('Items', [])
+    except (ClientError, BotoCoreError):
+        # includes missing credentials and an unreachable endpoint
+        _recent_unavailable_until = time.monotonic() + GSI_RETRY_SECONDS
+        return None
+
+def recent_donations(limit):
+    """Newest donations first, from the GSI when available"""
+    queried = db_query_recent('donations', limit)
+    if queried is not None:
+        return queried
+    return versioned('recent_donations', ('donations',),
+                     lambda: heapq.nlargest(limit, db_scan('donations'), key=lambda x: x.get('donation_date') or ''),
+                     limit)
+
+def _located_by_last_donation(donors, location):
+    # location filter and ordering get_compatible_donors applies to queried donors
+    loc = location.lower() if location else ''
+    results = [d for d in donors
+               if not loc or loc in str(d.get('city', '')).lower() or loc in str(d.get('state', '')).lower()]
     results.sort(key=lambda x: (x.get('last_donation') or '1900-01-01'), reverse=True)
     return results
 
+def get_compatible_donors(recipient_blood_group, location=None):
+    queried = query_compatible_donors(recipient_blood_group)
+    if queried is not None:
+        return _located_by_last_donation(queried, location)
+    columns = _get_donor_columns()
+    if columns is not None:
+        return [columns.donors[row] for row in columns.compatible_rows(recipient_blood_group, location)]
+    compatible_bgs = RECEIVE_FROM_SETS.get(recipient_blood_group, frozenset())
+    loc = location.lower() if location else ''
+    ranked = []
+    for d, city, state, sort_key in donor_places():
+        if d.get('blood_group') in compatible_bgs and d.get('available') and d.get('status') == 'active':
+            if not loc or loc in city or loc in state:
+                ranked.append((sort_key, d))
+    ranked.sort(key=itemgetter(0), reverse=True)
+    return [d for _, d in ranked]
+
 def match_blood_request(request_data):
     blood_group = request_data['blood_group']
     units_needed = request_data['units_needed']
     location = request_data.get('location', '')
-    compatible_donors = get_compatible_donors(blood_group, location)
-    scored = []
-    for donor in compatible_donors:
-        scored.append({
-            **donor,
-            'match_score': calculate_donor_eligibility(donor),
-            'can_donate_now': can_donate(donor.get('last_donation'))
-        })
-    scored.sort(key=lambda x: x['match_score'], reverse=True)
-    inventory_items = db_scan('inventory')
-    inventory_map = {i['blood_group']: int(i.get('units', 0)) for i in inventory_items}
-    inventory_available = inventory_map.get(blood_group, 0)
+    queried = query_compatible_donors(blood_group)
+    # the column path only covers the local stores; queried DynamoDB donors are scored in Python
+    columns = _get_donor_columns() if queried is None else None
+    if columns is not None:
+        rows = columns.compatible_rows(blood_group, location)
+        scores, can_donate_now = columns.score_rows(rows)
+        top = np.argsort(-scores, kind='stable')[:10]
+        top_donors = [{
+            **columns.donors[rows[i]],
+            'match_score': int(scores[i]),
+            'can_donate_now': bool(can_donate_now[i])
+        } for i in top]
+        total_compatible = len(rows)
+    else:
+        if queried is not None:
+            compatible_donors = _located_by_last_donation(queried, location)
+        else:
+            compatible_donors = get_compatible_donors(blood_group, location)
+        scored = []
+        for donor in compatible_donors:
+            scored.append({
+                **donor,
+                'match_score': calculate_donor_eligibility(donor),
+                'can_donate_now': can_donate(donor.get('last_donation'))
+            })
+        scored.sort(key=lambda x: x['match_score'], reverse=True)
+        top_donors = scored[:10]
+        total_compatible = len(scored)
+    inventory_item = db_get_inventory_by_bg(blood_group)
+    inventory_available = int(inventory_item.get('units', 0)) if inventory_item else 0
     remaining_units = units_needed - request_data.get('fulfilled_units', 0)
     return {
         'exact_match_inventory': inventory_available,
-        'compatible_donors': scored[:10],
-        'total_compatible': len(scored),
-        'fulfillable': inventory_available >= remaining_units or len(scored) > 0,
+        'compatible_donors': top_donors,
+        'total_compatible': total_compatible,
+        'fulfillable': inventory_available >= remaining_units or total_compatible > 0,
         'remaining_units': remaining_units
     }
 
 # --- Routes (minimal set mirroring original app) ---
 @app.route('/')
 def home():
-    recent = sorted(db_scan('requests'), key=lambda x: x.get('created_at') or '', reverse=True)[:5]
-    requests_list = db_scan('requests')
-    inventory_items = db_scan('inventory')
-
-    # build inventory map expected by templates (ensure all blood groups present)
-    inventory_map = {}
-    for item in inventory_items:
-        bg = item.get('blood_group') or item.get('group') or 'Unknown'
-        inventory_map[bg] = {
-            'units': int(item.get('units', 0)),
-            'donors': item.get('donors') or []
-        }
+    recent, stats = versioned('home', ('requests', 'inventory', 'donors'), compute_home_stats)
+    return render_template('index.html', recent_requests=recent, stats=stats)
 
-    # ensure every standard blood group exists in inventory_map
-    BLOOD_GROUPS = sorted(set(list(BLOOD_COMPATIBILITY.keys()) + list(RECEIVE_COMPATIBILITY.keys())))
-    for bg in BLOOD_GROUPS:
-        inventory_map.setdefault(bg, {'units': 0, 'donors': []})
+def compute_home_stats():
+    requests_list = db_scan('requests')
+    recent = heapq.nlargest(5, requests_list, key=lambda x: x.get('created_at') or '')
+    inventory_map, _ = inventory_snapshot()
 
     stats = {
-        'total_donors': len(db_scan('donors')),
+        'total_donors': db_count('donors'),
         'total_requests': len(requests_list),
-        'fulfilled_requests': sum(1 for r in requests_list if r.get('status') == 'fulfilled'),
-        'total_units': sum(int(i.get('units', 0)) for i in inventory_items),
+        'fulfilled_requests': request_status_counts()['fulfilled'],
+        'total_units': inventory_units_total(),
         'inventory': inventory_map
     }
-    return render_template('index.html', recent_requests=recent, stats=stats)
+    return recent, stats
 
 @app.route('/donor/register', methods=['GET', 'POST'])
 def donor_register():
@@ -436,12 +1079,10 @@ def request_blood():
             'fulfilled_units': 0,
             'inventory_used': 0
         }
-        db_put('requests', req)
+        # matching only reads the donor stores, so the request is stored once, already matched
         match = match_blood_request(req)
         req['matched_donors'] = [d.get('donor_id') for d in match['compatible_donors']]
         db_put('requests', req)
-        # Ensure database is persisted
-        _save_json_file('blood_requests.json', list(blood_requests_db.values()))
         flash(f'Request created: {request_id}', 'success')
         return redirect(url_for('request_success', request_id=request_id))
     return render_template('request_blood.html')
@@ -476,34 +1117,27 @@ def fulfill_request(request_id):
         req['status'] = 'partial'
 
     # Reduce inventory if present
-    inventory_items = db_scan('inventory')
-    for item in inventory_items:
-        bg = item.get('blood_group') or item.get('group')
-        if bg and bg == req.get('blood_group'):
-            cur = int(item.get('units', 0))
-            item['units'] = max(0, cur - units)
-            item['fulfilled_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            db_put('inventory', item)
-            # Ensure persistence
-            _save_json_file('inventory.json', list(inventory_db.values()))
-            break
+    item = db_get_inventory_by_bg(req.get('blood_group'))
+    if item:
+        cur = int(item.get('units', 0))
+        item['units'] = max(0, cur - units)
+        item['fulfilled_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        db_put('inventory', item)
 
     db_put('requests', req)
-    _save_json_file('blood_requests.json', list(blood_requests_db.values()))
     flash('Request updated and inventory reduced', 'success')
     return redirect(url_for('request_details', request_id=request_id))
 
 @app.route('/api/statistics')
 def api_statistics():
-    donors = db_scan('donors')
-    requests = db_scan('requests')
-    inventory = db_scan('inventory')
-    total_units = sum(int(i.get('units', 0)) for i in inventory)
-    return jsonify({
-        'total_donors': len(donors),
-        'total_requests': len(requests),
-        'total_units': total_units
-    })
+    return jsonify(versioned('api_statistics', ('donors', 'requests', 'inventory'), compute_api_statistics))
+
+def compute_api_statistics():
+    return {
+        'total_donors': db_count('donors'),
+        'total_requests': db_count('requests'),
+        'total_units': inventory_units_total()
+    }
 
 
 # Minimal auth/dashboard routes so templates using url_for() don't fail
@@ -530,24 +1164,25 @@ def donor_dashboard():
     donor_id = session.get('donor_id')
     donor = None
     if donor_id:
-        donor = db_get('donors', {'donor_id': donor_id})
+        donor = db_get_cached('donors', donor_id)
 
     # Donation history and simple availability for template
     donations = db_scan('donations')
     # prepare a small recent donations list for template (pre-sorted and sliced)
-    recent_donations = sorted(donations, key=lambda x: x.get('donation_date') or '', reverse=True)[:10]
-    donation_history = [d for d in donations if d.get('donor_id') == donor_id] if donor_id else []
+    recent_donations = heapq.nlargest(10, donations, key=lambda x: x.get('donation_date') or '')
+    donation_history = list(donations_by_donor().get(donor_id, ())) if donor_id else []
     can_donate_now = can_donate(donor.get('last_donation')) if donor else False
 
     # Available requests donor can help (simple compatibility check)
     available_requests = []
     if donor:
         donor_bg = donor.get('blood_group')
-        can_donate_to = BLOOD_COMPATIBILITY.get(donor_bg, [])
+        can_donate_to = DONATE_TO_SETS.get(donor_bg, frozenset())
         for r in db_scan('requests'):
-            if r.get('blood_group') in can_donate_to and r.get('status') in ['pending', 'partial']:
+            if r.get('blood_group') in can_donate_to and r.get('status') in ACTIVE_STATUSES:
                 remaining = r.get('units_needed', 0) - r.get('fulfilled_units', 0)
-                available_requests.append({**r, 'remaining_units': remaining})
+                # Same shape as app.py's AvailableRequestView, which the template reads
+                available_requests.append({'request': r, 'remaining_units': remaining})
 
     # Assigned requests - not implemented: provide empty list to satisfy template
     assigned_requests = []
@@ -580,13 +1215,13 @@ def requestor_dashboard():
     requestor_id = session.get('requestor_id')
     requestor = None
     if requestor_id:
-        requestor = db_get('requestors', {'requestor_id': requestor_id})
+        requestor = db_get_cached('requestors', requestor_id)
     # Minimal context to satisfy template expectations
     my_requests = [r for r in db_scan('requests') if r.get('requestor_id') == requestor_id] if requestor_id else []
     stats = {
-        'total_donors': len(db_scan('donors')),
-        'total_requests': len(db_scan('requests')),
-        'total_units': sum(int(i.get('units', 0)) for i in db_scan('inventory'))
+        'total_donors': db_count('donors'),
+        'total_requests': db_count('requests'),
+        'total_units': inventory_units_total()
     }
     return render_template('requestor_dashboard.html', requestor=requestor, my_requests=my_requests, stats=stats)
 
@@ -633,11 +1268,7 @@ def donor_update(donor_id):
 @app.route('/donor/confirm/<assignment_id>', methods=['POST'])
 def donor_confirm_donation(assignment_id):
     # Minimal implementation: mark assignment as fulfilled and record a donation
-    assignment = None
-    for a in db_scan('assignments'):
-        if a.get('assignment_id') == assignment_id:
-            assignment = a
-            break
+    assignment = db_scan_get('assignments', assignment_id)
     if not assignment:
         flash('Assignment not found', 'error')
         return redirect(url_for('donor_dashboard'))
@@ -652,36 +1283,29 @@ def donor_confirm_donation(assignment_id):
         'donation_date': current_time,
         'donation_center': request.form.get('donation_center', '')
     }
-    db_put('donations', donation)
-    # Persist donations
-    _save_json_file('donations.json', list(donations_db.values()))
+    donor, req = db_batch_get([('donors', {'donor_id': donation.get('donor_id')}),
+                               ('requests', {'request_id': assignment.get('request_id')})])
+    # Every record touched below is written back in one batch at the end
+    writes = [('donations', donation)]
 
     # update donor record (total donations, last donation date)
-    donor = db_get('donors', {'donor_id': donation.get('donor_id')})
     if donor:
         donor['total_donations'] = int(donor.get('total_donations', 0)) + int(units)
         donor['last_donation'] = donation.get('donation_date')
-        db_put('donors', donor)
-        _save_json_file('donors.json', list(donors_db.values()))
+        writes.append(('donors', donor))
 
     # update inventory: add units to matching blood group and track donor
-    inv_items = db_scan('inventory')
-    found = False
-    for item in inv_items:
-        bg = item.get('blood_group') or item.get('group')
-        if bg and bg == donation.get('blood_group'):
-            cur = int(item.get('units', 0))
-            item['units'] = cur + int(units)
-            item['donation_date'] = current_time
-            donors_list = item.get('donors') or []
-            if donation.get('donor_id') not in donors_list:
-                donors_list.append(donation.get('donor_id'))
-            item['donors'] = donors_list
-            db_put('inventory', item)
-            _save_json_file('inventory.json', list(inventory_db.values()))
-            found = True
-            break
-    if not found:
+    item = db_get_inventory_by_bg(donation.get('blood_group'))
+    if item:
+        cur = int(item.get('units', 0))
+        item['units'] = cur + int(units)
+        item['donation_date'] = current_time
+        donors_list = item.get('donors') or []
+        if donation.get('donor_id') not in donors_list:
+            donors_list.append(donation.get('donor_id'))
+        item['donors'] = donors_list
+        writes.append(('inventory', item))
+    else:
         new_item = {
             'inventory_id': generate_id('INV'),
             'blood_group': donation.get('blood_group'),
@@ -689,23 +1313,21 @@ def donor_confirm_donation(assignment_id):
             'donors': [donation.get('donor_id')],
             'donation_date': current_time
         }
-        db_put('inventory', new_item)
-        _save_json_file('inventory.json', list(inventory_db.values()))
+        writes.append(('inventory', new_item))
 
     assignment['status'] = 'completed'
-    db_put('assignments', assignment)
-    _save_json_file('assignments.json', list(assignments_db.values()))
+    writes.append(('assignments', assignment))
 
     # Automatically update request fulfillment
-    req = db_get('requests', {'request_id': assignment.get('request_id')})
     if req:
         req['fulfilled_units'] = req.get('fulfilled_units', 0) + units
         if req['fulfilled_units'] >= req.get('units_needed', 0):
             req['status'] = 'fulfilled'
         else:
             req['status'] = 'partial'
-        db_put('requests', req)
-        _save_json_file('blood_requests.json', list(blood_requests_db.values()))
+        writes.append(('requests', req))
+
+    db_put_many(writes)
 
     flash('Donation confirmed. Request status updated automatically.', 'success')
     return redirect(url_for('donor_dashboard'))
@@ -715,8 +1337,7 @@ def donor_confirm_donation(assignment_id):
 @app.route('/donor/accept/<donor_id>/<request_id>', methods=['POST'])
 def donor_accept_request(donor_id, request_id):
     # Verify donor and request exist
-    donor = db_get('donors', {'donor_id': donor_id})
-    req = db_get('requests', {'request_id': request_id})
+    donor, req = db_batch_get([('donors', {'donor_id': donor_id}), ('requests', {'request_id': request_id})])
     
     if not donor:
         flash('Donor not found', 'error')
@@ -740,11 +1361,21 @@ def donor_accept_request(donor_id, request_id):
         'created_at': current_time
     }
     db_put('assignments', assignment)
-    _save_json_file('assignments.json', list(assignments_db.values()))
     flash(f'Request accepted! Assignment {assignment_id} created.', 'success')
     return redirect(url_for('donor_dashboard'))
 
 
+def find_donors(bg, location):
+    """Active donors matching the search form's blood group and location"""
+    loc = location.lower()
+    results = []
+    for donor, city, state, _ in donor_places():
+        bg_match = not bg or donor.get('blood_group') == bg
+        location_match = not loc or loc in city or loc in state
+        if bg_match and location_match and donor.get('status') == 'active':
+            results.append(donor)
+    return results
+
 # Search donors
 @app.route('/search-donors', methods=['GET', 'POST'])
 def search_donors():
@@ -757,23 +1388,19 @@ def search_donors():
         search_performed = True
         
         # Search donors by blood group and location
-        all_donors = db_scan('donors')
-        for donor in all_donors:
-            bg_match = not bg or donor.get('blood_group') == bg
-            location_match = not location or location.lower() in str(donor.get('city', '')).lower() or location.lower() in str(donor.get('state', '')).lower()
-            if bg_match and location_match and donor.get('status') == 'active':
-                results.append(donor)
+        results = versioned('search_donors', ('donors',), lambda: find_donors(bg, location), bg, location)
     else:
-        # GET request - show all available donors by default
-        all_donors = db_scan('donors')
-        results = [d for d in all_donors if d.get('status') == 'active']
-        
         # If specific query params provided, filter results
         q = request.args.get('q', '')
         bg = request.args.get('blood_group')
         if q or bg:
             search_performed = True
-            results = get_compatible_donors(bg or '', q)
+            results = versioned('compatible_donors', ('donors',), lambda: get_compatible_donors(bg or '', q),
+                                bg or '', q)
+        else:
+            # GET request - show all available donors by default
+            results = versioned('active_donors', ('donors',),
+                                lambda: [d for d in db_scan('donors') if d.get('status') == 'active'])
     
     return render_template('search_donors.html', results=results, search_performed=search_performed)
 
@@ -781,81 +1408,108 @@ def search_donors():
 # Blood inventory view
 @app.route('/inventory')
 def blood_inventory_view():
-    items = db_scan('inventory')
-    # Build inventory mapping expected by template (keys = blood group)
-    inventory_map = {}
-    for item in items:
-        bg = item.get('blood_group') or item.get('group') or 'Unknown'
-        units = int(item.get('units', 0))
-        donors = item.get('donors') or []
-        inventory_map[bg] = {
-            'units': units,
-            'donors': donors
-        }
+    return conditional_response(('donors', 'requests', 'inventory', 'donations'), render_blood_inventory)
 
-    # Compute stats used by the template
-    requests_list = db_scan('requests')
-    # ensure all blood groups present
-    BLOOD_GROUPS = sorted(set(list(BLOOD_COMPATIBILITY.keys()) + list(RECEIVE_COMPATIBILITY.keys())))
-    for bg in BLOOD_GROUPS:
-        inventory_map.setdefault(bg, {'units': 0, 'donors': []})
+def render_blood_inventory():
+    inventory_map, stats = versioned('inventory_view', ('donors', 'requests', 'inventory'), compute_inventory_view)
+    # Get recent donation transactions (last 20)
+    donation_transactions = recent_donations(20)
+    return render_template('blood_inventory.html', inventory=inventory_map, stats=stats, donation_transactions=donation_transactions)
 
+def compute_inventory_view():
+    inventory_map, critical_groups = inventory_snapshot()
+
+    # Compute stats used by the template
     stats = {
-        'total_donors': len(db_scan('donors')),
-        'total_requests': len(requests_list),
-        'fulfilled_requests': sum(1 for r in requests_list if r.get('status') == 'fulfilled'),
-        'total_units': sum(int(i.get('units', 0)) for i in items),
-        'critical_groups': [bg for bg, v in inventory_map.items() if v['units'] < 20],
+        'total_donors': db_count('donors'),
+        'total_requests': db_count('requests'),
+        'fulfilled_requests': request_status_counts()['fulfilled'],
+        'total_units': inventory_units_total(),
+        'critical_groups': critical_groups,
         'inventory': inventory_map
     }
-
-    # Get recent donation transactions (last 20)
-    donation_transactions = sorted(db_scan('donations'), key=lambda x: x.get('donation_date') or '', reverse=True)[:20]
-    return render_template('blood_inventory.html', inventory=inventory_map, stats=stats, donation_transactions=donation_transactions)
+    return inventory_map, stats
 
 
 # Admin dashboard
 @app.route('/admin')
 def admin_dashboard():
+    return conditional_response(ADMIN_STORES, render_admin_dashboard)
+
+def render_admin_dashboard():
+    context = versioned('admin_dashboard', ADMIN_STORES, compute_admin_dashboard)
+    return render_template('admin_dashboard.html', **context)
+
+# every store the admin dashboard reads
+ADMIN_STORES = ('donors', 'requestors', 'requests', 'donations', 'inventory', 'donor_registrations')
+
+def compute_admin_dashboard():
     donors = db_scan('donors')
     requests_list = db_scan('requests')
     donations = db_scan('donations')
     inventory_items = db_scan('inventory')
-    registrations = sorted(db_scan('donor_registrations'), key=lambda x: x.get('registered_at') or '', reverse=True)[:10]
-    recent_donations = sorted(donations, key=lambda x: x.get('donation_date') or '', reverse=True)[:10]
+    registrations = heapq.nlargest(10, db_scan('donor_registrations'), key=lambda x: x.get('registered_at') or '')
+    recent_donations = heapq.nlargest(10, donations, key=lambda x: x.get('donation_date') or '')
     # build inventory map
     inventory_map = {}
     for item in inventory_items:
         bg = item.get('blood_group') or item.get('group') or 'Unknown'
         inventory_map[bg] = {'units': int(item.get('units', 0))}
 
+    statuses = request_status_counts()
     stats = {
         'total_donors': len(donors),
-        'total_requestors': len(db_scan('requestors')),
+        'total_requestors': db_count('requestors'),
         'total_requests': len(requests_list),
-        'active_requests': sum(1 for r in requests_list if r.get('status') in ['pending', 'partial']),
-        'fulfilled_requests': sum(1 for r in requests_list if r.get('status') == 'fulfilled'),
-        'total_units': sum(int(i.get('units', 0)) for i in inventory_items),
+        'active_requests': sum(statuses[status] for status in ACTIVE_STATUSES),
+        'fulfilled_requests': statuses['fulfilled'],
+        'total_units': inventory_units_total(),
         'inventory': inventory_map
     }
-    return render_template('admin_dashboard.html', stats=stats, donors=donors, requests=requests_list, donations=donations, registrations=registrations, recent_donations=recent_donations)
-
+    return dict(stats=stats, donors=donors, requests=requests_list, donations=donations, registrations=registrations, recent_donations=recent_donations)
+
+
+# Pages drawn only from their URL, rendered once and reused
+STATIC_PAGE_MAX_AGE = 3600   # seconds browsers/CDNs may reuse them
+STATIC_PAGE_CACHE_SIZE = 256
+_static_pages = {}
+
+def render_static(template, max_age=STATIC_PAGE_MAX_AGE, **context):
+    """render_template for pages that depend only on their arguments
+
+    A page rendered while flash messages are pending shows (and consumes)
+    them, so it is neither cached here nor marked cacheable.
+    """
+    if '_flashes' in session:
+        return render_template(template, **context)
+    key = (template, tuple(sorted(context.items())))
+    html = _static_pages.get(key)
+    if html is None:
+        html = render_template(template, **context)
+        if len(_static_pages) >= STATIC_PAGE_CACHE_SIZE:
+            _static_pages.clear()
+        _static_pages[key] = html
+    response = app.make_response(html)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
 
 @app.route('/about')
 def about():
-    return render_template('about.html')
+    return render_static('about.html')
 
 
 # Registration success page
 @app.route('/registration-success/<role>/<entity_id>')
 def registration_success(role, entity_id):
-    return render_template('registration_success.html', role=role, entity_id=entity_id)
+    return render_static('registration_success.html', max_age=60, role=role, entity_id=entity_id)
 
 
 # Request submission success
 @app.route('/request-success/<request_id>')
 def request_success(request_id):
-    return render_template('request_success.html', request_id=request_id)
+    return render_static('request_success.html', max_age=60, request_id=request_id)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; production runs wsgi:application under gunicorn.
+    # FLASK_DEBUG=0 turns off the reloader and debugger.
+    app.run(debug=os.environ.get('FLASK_DEBUG', '1') != '0', host='0.0.0.0', port=5000)
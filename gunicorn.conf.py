@@ -0,0 +1,28 @@
+"""
+gunicorn.conf.py
+Production server settings for the DynamoDB app:
+
+    gunicorn -c gunicorn.conf.py
+
+Handlers spend most of their time waiting on DynamoDB, so each worker runs a
+pool of threads and keeps client connections alive between requests.
+"""
+import os
+
+wsgi_app = 'wsgi:application'
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# The JSON fallback stores live in each worker's memory, so more than one
+# worker only makes sense when the DynamoDB tables are reachable.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+keepalive = 30
+# No preload_app: each worker imports the app itself, so no boto3 session or
+# connection is ever inherited across a fork (threads build their own).
+
+
+def worker_exit(server, worker):
+    # write fallback changes still waiting on the flush timer
+    from app_aws import flush_dirty_tables
+    flush_dirty_tables()
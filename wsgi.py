@@ -0,0 +1,10 @@
+"""
+wsgi.py
+WSGI entry point for production servers:
+
+    gunicorn -c gunicorn.conf.py
+    gunicorn -k gthread --threads 8 wsgi:application
+"""
+from app_aws import app
+
+application = app